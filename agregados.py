@@ -0,0 +1,104 @@
+# ============================================================
+# 📌 agregados.py — Cubo de conteos precalculado
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from clasificador import COLUMNA_BITS
+from data_loader import clave_datos
+
+# Dimensiones del cubo: cada fila es una combinación con su número de registros
+DIMENSIONES = (
+    "AÑO",
+    "REGIÓN",
+    "DEPARTAMENTO",
+    "SECTOR",
+    "AUTORIDAD AMBIENTAL",
+    COLUMNA_BITS,
+)
+
+
+# ============================================================
+# 🧊 Construcción del cubo
+# ============================================================
+
+def construir_cubo(df, dimensiones=DIMENSIONES):
+    """
+    Agrupa el DataFrame por todas las dimensiones presentes y cuenta registros.
+    Los valores vacíos se conservan como grupo propio para no perder totales.
+    """
+    presentes = [col for col in dimensiones if col in df.columns]
+
+    if not presentes:
+        return pd.DataFrame({"TOTAL": [len(df)]})
+
+    cubo = (
+        df.groupby(presentes, dropna=False, observed=True)
+        .size()
+        .reset_index(name="TOTAL")
+    )
+
+    # El cubo es pequeño: columnas planas evitan que los groupby posteriores
+    # devuelvan categorías no observadas (con total cero)
+    categoricas = {
+        col: object for col in presentes if isinstance(cubo[col].dtype, pd.CategoricalDtype)
+    }
+    return cubo.astype(categoricas)
+
+
+@st.cache_data(show_spinner=False)
+def _cubo_en_cache(_df, clave):
+    return construir_cubo(_df)
+
+
+def cubo_agregado(df):
+    """
+    Cubo de conteos del DataFrame completo, calculado una vez por versión
+    del dataset. Los gráficos leen porciones del cubo en lugar de recorrer
+    todas las filas en cada rerun.
+    """
+    presentes = [col for col in DIMENSIONES if col in df.columns]
+    return _cubo_en_cache(df, clave_datos(df, presentes))
+
+
+@st.cache_data(show_spinner=False)
+def _conteo_en_cache(_df, clave, columna):
+    return _df[columna].value_counts()
+
+
+def conteo_marginal(df, columna):
+    """``value_counts`` de una columna fuera del cubo, cacheado por versión."""
+    return _conteo_en_cache(df, clave_datos(df, [columna]), columna)
+
+
+# ============================================================
+# 🔎 Consultas sobre el cubo
+# ============================================================
+
+def totales(cubo, dimension):
+    """Registros por valor de ``dimension`` (mayor a menor, sin vacíos)."""
+    return (
+        cubo.groupby(dimension)["TOTAL"]
+        .sum()
+        .sort_values(ascending=False, kind="stable")
+    )
+
+
+def alineadas(cubo):
+    """True en las combinaciones con alguna categoría Basura Cero."""
+    if COLUMNA_BITS not in cubo.columns:
+        return np.zeros(len(cubo), dtype=bool)
+
+    return cubo[COLUMNA_BITS].to_numpy() != 0
+
+
+def resumen_alineacion(cubo, dimension):
+    """TOTAL y ALINEADOS (con relación Basura Cero) por valor de ``dimension``."""
+    return (
+        cubo.assign(ALINEADOS=np.where(alineadas(cubo), cubo["TOTAL"], 0))
+        .groupby(dimension)[["TOTAL", "ALINEADOS"]]
+        .sum()
+        .reset_index()
+    )
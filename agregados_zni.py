@@ -0,0 +1,221 @@
+# ============================================================
+# 📌 agregados_zni.py — Agregados precalculados del dataset ZNI
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import clave_datos
+from data_loader_zni import continental
+from kpi_zni import COLUMNA_ANIO, MEDIDAS
+
+# Llaves del cubo, de la más gruesa a la más fina
+DEPARTAMENTO, MUNICIPIO = "DEPARTAMENTO", "MUNICIPIO"
+
+
+def _planas(df):
+    """Columnas categóricas → texto (tablas pequeñas, sin categorías vacías)."""
+    return df.astype({
+        col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)
+    })
+
+
+# ============================================================
+# 🧊 Cubo departamento × municipio × año
+# ============================================================
+
+class CuboEnergia:
+    """
+    Energía por (departamento, municipio, año) con las medidas de ``MEDIDAS``
+    (sumas de energía y máximo de potencia), sin San Andrés.
+
+    Las filas del cubo se indexan por año (tramos contiguos) y cada fila
+    lleva el código de su municipio y de su departamento, así un top-N con
+    o sin filtro de años es un ``bincount`` + ``argpartition`` sobre el cubo,
+    sin ordenar tablas completas.
+    """
+
+    def __init__(self, df):
+        base = df[continental(df)]
+        self.medidas = {col: func for col, func in MEDIDAS.items() if col in base.columns}
+
+        self.tabla = _planas(
+            base.groupby([DEPARTAMENTO, MUNICIPIO, COLUMNA_ANIO], observed=True)
+            .agg(self.medidas)
+            .reset_index()
+        )
+
+        # Códigos por fila: municipio (par depto, municipio) y departamento
+        self._cod_municipio, municipios = pd.MultiIndex.from_frame(
+            self.tabla[[DEPARTAMENTO, MUNICIPIO]]
+        ).factorize()
+        self.municipios = municipios.to_frame(index=False, name=[DEPARTAMENTO, MUNICIPIO])
+        self._cod_departamento, self.departamentos = pd.factorize(self.tabla[DEPARTAMENTO])
+
+        # Índice por año: filas ordenadas por año → cada año es un tramo
+        anios = self.tabla[COLUMNA_ANIO].to_numpy()
+        self._orden_anio = np.argsort(anios, kind="stable")
+        self.anios, self._inicio_anio = np.unique(anios[self._orden_anio], return_index=True)
+        self._fin_anio = np.r_[self._inicio_anio[1:], len(anios)]
+
+        # Totales de todos los años, precalculados
+        self._totales = {
+            (nivel, medida): self._agregar(nivel, medida, None)
+            for nivel in ("municipio", "departamento")
+            for medida in self.medidas
+        }
+
+    # --------------------------------------------------------
+    def filas_anios(self, anios):
+        """Posiciones de las filas del cubo de los ``anios`` pedidos."""
+        posiciones = np.searchsorted(self.anios, anios)
+        tramos = [
+            self._orden_anio[self._inicio_anio[p]:self._fin_anio[p]]
+            for p, anio in zip(posiciones, anios)
+            if p < len(self.anios) and self.anios[p] == anio
+        ]
+        return np.concatenate(tramos) if tramos else np.array([], dtype=np.intp)
+
+    def _agregar(self, nivel, medida, filas):
+        """Medida agregada por municipio o departamento (NaN donde no hay filas)."""
+        if nivel == "municipio":
+            codigos, k = self._cod_municipio, len(self.municipios)
+        else:
+            codigos, k = self._cod_departamento, len(self.departamentos)
+
+        valores = self.tabla[medida].to_numpy(dtype=float, na_value=np.nan)
+        if filas is not None:
+            codigos, valores = codigos[filas], valores[filas]
+
+        if self.medidas[medida] == "max":
+            salida = np.full(k, np.nan)
+            np.fmax.at(salida, codigos, valores)
+            return salida
+
+        salida = np.bincount(codigos, weights=np.nan_to_num(valores), minlength=k).astype(float)
+        salida[np.bincount(codigos, minlength=k) == 0] = np.nan
+        return salida
+
+    def _top(self, nivel, medida, n, anios):
+        if anios is None:
+            valores = self._totales[(nivel, medida)]
+        else:
+            valores = self._agregar(nivel, medida, self.filas_anios(np.atleast_1d(anios)))
+
+        # argpartition deja los n mayores al frente; solo esos se ordenan
+        candidatos = np.flatnonzero(~np.isnan(valores))
+        n = min(n, len(candidatos))
+        if n == 0:
+            return np.array([], dtype=np.intp), np.array([])
+
+        parte = candidatos[np.argpartition(-valores[candidatos], n - 1)[:n]]
+        parte = parte[np.argsort(-valores[parte], kind="stable")]
+        return parte, valores[parte]
+
+    def _columna(self, medida, valores):
+        """Conserva el tipo entero de las sumas de energía."""
+        if pd.api.types.is_integer_dtype(self.tabla[medida].dtype):
+            return np.rint(valores).astype("int64")
+        return valores
+
+    # --------------------------------------------------------
+    def top_municipios(self, medida="ENERGÍA ACTIVA", n=5, anios=None):
+        """Los ``n`` municipios con mayor ``medida`` (todos los años o solo ``anios``)."""
+        posiciones, valores = self._top("municipio", medida, n, anios)
+
+        top = self.municipios.iloc[posiciones].reset_index(drop=True)
+        top[medida] = self._columna(medida, valores)
+        return top
+
+    def top_departamentos(self, medida="ENERGÍA ACTIVA", n=5, anios=None):
+        """Los ``n`` departamentos con mayor ``medida`` (todos los años o solo ``anios``)."""
+        posiciones, valores = self._top("departamento", medida, n, anios)
+
+        return pd.DataFrame({
+            DEPARTAMENTO: self.departamentos[posiciones],
+            medida: self._columna(medida, valores),
+        })
+
+
+# ============================================================
+# 🧱 Tablas para las apps de energía
+# ============================================================
+
+def construir_agregados(df, cubo=None):
+    """
+    Todas las tablas que usan las apps de energía, derivadas del cubo:
+
+    - ``por_municipio``: energía activa/reactiva por departamento y municipio
+    - ``por_departamento``: la misma suma por departamento
+    - ``por_departamento_anio``: energía activa por departamento y año
+    - ``series_departamento``: la tabla anterior separada por departamento
+    - ``pivote``: departamento × año (energía activa)
+    - ``activa_por_anio``: energía activa total por año
+    - ``resumen``: filas, columnas, departamentos y municipios del dataset
+
+    Las tablas de energía excluyen San Andrés (como las gráficas originales).
+    """
+    tabla = (cubo if cubo is not None else CuboEnergia(df)).tabla
+    energia = ["ENERGÍA ACTIVA", "ENERGÍA REACTIVA"]
+
+    por_municipio = tabla.groupby([DEPARTAMENTO, MUNICIPIO])[energia].sum().reset_index()
+    por_departamento_anio = (
+        tabla.groupby([DEPARTAMENTO, COLUMNA_ANIO])["ENERGÍA ACTIVA"].sum().reset_index()
+    )
+
+    return {
+        "por_municipio": por_municipio,
+        "por_departamento": por_municipio.groupby(DEPARTAMENTO)[energia].sum().reset_index(),
+        "por_departamento_anio": por_departamento_anio,
+        "series_departamento": {
+            depto: serie.reset_index(drop=True)
+            for depto, serie in por_departamento_anio.groupby(DEPARTAMENTO, sort=False)
+        },
+        "pivote": por_departamento_anio.pivot_table(
+            index=DEPARTAMENTO, columns=COLUMNA_ANIO, values=["ENERGÍA ACTIVA"], aggfunc="sum"
+        ),
+        "activa_por_anio": por_departamento_anio.groupby(COLUMNA_ANIO)["ENERGÍA ACTIVA"].sum(),
+        "resumen": {
+            "filas": df.shape[0],
+            "columnas": df.shape[1],
+            "departamentos": df[DEPARTAMENTO].nunique(),
+            "municipios": df[MUNICIPIO].nunique(),
+        },
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _cubo_en_cache(_df, clave):
+    return CuboEnergia(_df)
+
+
+def cubo_energia(df):
+    """Cubo de energía compartido entre sesiones, uno por versión del dataset (solo lectura)."""
+    return _cubo_en_cache(df, clave_datos(df))
+
+
+@st.cache_data(show_spinner=False)
+def _agregados_en_cache(_df, clave):
+    return construir_agregados(_df, cubo_energia(_df))
+
+
+def agregados_zni(df):
+    """Agregados ZNI calculados una vez por versión del dataset."""
+    return _agregados_en_cache(df, clave_datos(df))
+
+
+# ============================================================
+# 🔎 Consultas
+# ============================================================
+
+def lista_departamentos(agregados):
+    """Departamentos continentales con datos (orden alfabético)."""
+    return list(agregados["series_departamento"])
+
+
+def serie_departamento(agregados, departamento):
+    """Energía activa por año de un departamento (búsqueda directa, sin filtrar filas)."""
+    return agregados["series_departamento"].get(
+        departamento, agregados["por_departamento_anio"].iloc[:0]
+    )
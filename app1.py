@@ -28,13 +28,20 @@ from typing import Optional  # (repetido pero no afecta funcionalidad)
 
 import re          # Expresiones regulares para limpieza de texto.
 import textwrap    # Manejo de bloques de texto multilínea.
-import base64      # Permite convertir imágenes a texto base64.
 
 import matplotlib.pyplot as plt  # Graficación principal.
 import pandas as pd              # Manejo de datos tabulares.
 import seaborn as sns            # Gráficos estadísticos.
 import streamlit as st           # Framework de interfaz web.
 
+from cache_figuras import mostrar_figura  # Figuras renderizadas una vez por datos.
+from dataset import DatasetCompartido  # Dataset compartido entre sesiones (vistas sin copia).
+from canonico import REGLAS_DEPARTAMENTO, canonizar_serie  # Canonización por valor distinto.
+from clasificador import ClasificadorBasuraCero  # Clasificador Basura Cero vectorizado.
+from filtros import indice_filtros  # Índice invertido para los filtros de la barra lateral.
+from estilos import aplicar_estilos  # Hoja de estilos compuesta una vez.
+from recursos import imagen_liviana  # Imágenes redimensionadas una vez.
+
 
 # ============================================================
 # 1️⃣ Cargar el dataset
@@ -127,27 +134,16 @@ def normalizar_region(valor: Optional[str]) -> Optional[str]:
     return texto
 
 
-def normalizar_departamento(valor: Optional[str]) -> Optional[str]:
-    """Devuelve el nombre canónico del departamento si es posible."""
-
-    if pd.isna(valor):  # Maneja valores faltantes
-        return pd.NA
-
-    texto = str(valor).strip().upper()  # Limpia texto
-    texto = texto.replace(".", " ").replace(",", " ")  # Elimina signos
-    texto = re.sub(r"\s+", " ", texto)  # Unifica espacios
-    sin_tildes = texto.translate(str.maketrans("ÁÉÍÓÚÜ", "AEIOUU"))  # Sin tildes
-
-    # Retorna nombre corregido si existe en el diccionario
-    return DEPARTMENT_CANONICAL.get(sin_tildes, texto)
+# Departamento → nombre canónico con el diccionario de esta app (reglas de canonico.py)
+REGLAS_DEPARTAMENTO_APP = {**REGLAS_DEPARTAMENTO, "diccionario": DEPARTMENT_CANONICAL}
 
 # ============================================================
 # Función principal para cargar y limpiar datos
 # ============================================================
 
-@st.cache_data(show_spinner=False)
-def load_data() -> pd.DataFrame:
-    """Descarga, limpia y regresa el dataset ya procesado."""
+@st.cache_resource(show_spinner=False)
+def load_data() -> DatasetCompartido:
+    """Descarga y limpia el dataset una vez; se comparte entre sesiones (solo lectura)."""
 
     df = pd.read_csv(DATA_URL)  # Carga del CSV remoto
 
@@ -241,7 +237,7 @@ def load_data() -> pd.DataFrame:
 
     # Normalización de departamento
     if "DEPARTAMENTO" in df.columns:
-        df["DEPARTAMENTO"] = df["DEPARTAMENTO"].astype("string").map(normalizar_departamento)
+        df["DEPARTAMENTO"] = canonizar_serie(df["DEPARTAMENTO"], **REGLAS_DEPARTAMENTO_APP)
 
     # --- Limpia numeración tipo "1.1.2." ---
     def limpiar_numeros(texto):
@@ -253,7 +249,10 @@ def load_data() -> pd.DataFrame:
         if col in df.columns:
             df[col] = df[col].apply(limpiar_numeros)
 
-    return df
+    # Versión del contenido (calculada una sola vez) para las cachés derivadas
+    df.attrs["version"] = str(pd.util.hash_pandas_object(df, index=False).sum())
+
+    return DatasetCompartido(df)
 
 # ============================================================
 # Clasificación BASURA CERO
@@ -271,129 +270,36 @@ categorias_basura_cero = {
 }
 
 
-def tipo_relacion_basura_cero(fila):
-    """Detecta palabras clave y asigna categoría de economía circular."""
-    texto = f"{fila['DESCRIPCIÓN']} {fila['SECTOR']} {fila['SUBSECTOR']}".lower()
-    tipos = []
+# Palabras clave compiladas una sola vez; clasifica el DataFrame completo
+clasificador_basura_cero = ClasificadorBasuraCero(categorias_basura_cero)
 
-    # Revisa coincidencias con cada categoría
-    for categoria, palabras in categorias_basura_cero.items():
-        if any(p in texto for p in palabras):
-            tipos.append(categoria)
 
-    return ", ".join(tipos) if tipos else "No aplica"
+def tipo_relacion_basura_cero(df):
+    """Categorías Basura Cero de cada negocio ("No aplica" si ninguna)."""
+    tipos, _ = clasificador_basura_cero.clasificar(df)
+    return tipos
 
-# ============================================================
-# Manejo de imágenes y estilos
-# ============================================================
 
-def img_to_base64(img_path):
-    """Convierte una imagen local en base64 para usarla como fondo."""
-    try:
-        with open(img_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except FileNotFoundError:
-        # Solo muestra la advertencia una vez
-        if not st.session_state.get("_banner_warning_shown", False):
-            st.warning(f"Imagen no encontrada: {img_path}")
-            st.session_state["_banner_warning_shown"] = True
-        return None
+def relacion_basura_cero(df):
+    """Sí o No según si el negocio tiene alguna categoría Basura Cero."""
+    return df["Tipo_Relacion_Basura_Cero"].apply(lambda x: "Sí" if x != "No aplica" else "No")
+
+
+# Columnas derivadas: se calculan una vez y se comparten con cada vista
+COLUMNAS_BASURA_CERO = {
+    "Tipo_Relacion_Basura_Cero": tipo_relacion_basura_cero,
+    "Relacion_Basura_Cero": relacion_basura_cero,
+}
 
 # ============================================================
 # Render del encabezado visual
 # ============================================================
 
 def render_header(df):
-    """Dibuja banner, CSS y métricas del dataset."""
+    """Dibuja banner y métricas del dataset (estilos en assets/app1.css)."""
 
-    banner_base64 = img_to_base64("img/verde2.png")
-    # Si la imagen existe, configura CSS para usarla
-    if banner_base64:
-        background_css = (f'background-image: url("data:image/png;base64,{banner_base64}");')
-
-    # Inserta estilos personalizados
     st.markdown(
-        f"""
-        <style>
-        /* muchos estilos CSS (encabezado, métricas, banner, botones) */
-                [data-testid="stHeader"] {{
-            background: linear-gradient(90deg, #88C999, #A8E55A) !important;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        [data-testid="stHeader"] * {{
-            color: #1C3B2F !important;
-        }}
-        [data-testid="stAppViewContainer"], body {{
-            background-color: #E6FFF7 !important;
-            font-family: 'Arial', sans-serif;
-            }}
-        div[data-testid="stMetric"] {{
-                background: rgba(255, 255, 255, 0.9);
-                padding: 0.5rem 3rem;
-                border-radius: 0.75rem;
-                border: 2px solid rgba(74, 154, 135, 0.6);
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05);
-                margin: 0.01rem auto;
-                max-width: 200px;
-                border: 2px solid rgba(74, 154, 135, 0.6);
-            }}
-
-            .metric {{
-                background: #F0FFF4;
-                padding: 15px;
-                border-radius: 8px;
-                border-left: 5px solid #A8E55A;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                text-align: center;
-            }}
-            .banner-container {{
-                position: relative;
-                width: 100%;
-                height: 220px;
-                {background_css}
-                background-size: cover;
-                background-position: center;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                border-radius: 10px;
-                border-bottom: 3px solid #c9b79c;
-                margin-bottom: 1.5rem;
-                overflow: hidden;
-            }}
-            button {{
-            background: linear-gradient(45deg, #A8E55A, #88C999);
-            color: #1C3B2F;
-            border: none;
-            padding: 12px 20px;
-            font-weight: bold;
-            cursor: pointer;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            button:hover {{
-                background: linear-gradient(45deg, #9CD25B, #7BBF8A);
-                color: #0F261D;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-            }}
-            .banner-container::before {{
-                content: "";
-                position: absolute;
-                inset: 0;
-                background: linear-gradient(45deg, rgba(0,0,0,0.45), rgba(0,0,0,0.15));
-            }}
-            .banner-container h1 {{
-                position: relative;
-                color: #ffffff;
-                font-size: 2.2rem;
-                text-shadow: 2px 2px 6px rgba(0, 0, 0, 0.4);
-                margin: 0;
-                padding: 0 1rem;
-                text-align: center;
-            }}
-        </style>
+        """
         <div class="banner-container">
             <h1>Basura Cero | Economía Circular</h1>
         </div>
@@ -447,38 +353,46 @@ def plot_if_not_empty(func, df):
 # Funciones de graficado
 # ============================================================
 
+def _dibujar_top_departamentos(top, tamano):
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.barplot(x=top.values, y=top.index, palette="crest", ax=ax)
+    ax.set_title("Top 10 Departamentos por número de negocios")
+    return fig
+
 def plot_top_departamentos(df):
     """Gráfico: Top 10 departamentos."""
     top = df["DEPARTAMENTO"].value_counts().head(10).sort_values()
+    mostrar_figura("app1.top_departamentos", top, _dibujar_top_departamentos, (8, 4))
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.barplot(x=top.values, y=top.index, palette="crest", ax=ax)
-    ax.set_title("Top 10 Departamentos por número de negocios")
-    st.pyplot(fig)
+def _dibujar_categoria_sector(data, tamano):
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.barplot(data=data, x="Cantidad", y="CATEGORÍA", hue="SECTOR", palette="Set2", ax=ax)
+    return fig
 
 def plot_categoria_sector(df):
     """Gráfico: Categoría vs Sector."""
     data = df.groupby(["CATEGORÍA", "SECTOR"]).size().reset_index(name="Cantidad")
+    mostrar_figura("app1.categoria_sector", data, _dibujar_categoria_sector, (10, 5))
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.barplot(data=data, x="Cantidad", y="CATEGORÍA", hue="SECTOR", palette="Set2", ax=ax)
-    st.pyplot(fig)
+def _dibujar_heatmap(matriz, tamano):
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.heatmap(matriz, cmap="YlGnBu", annot=True, fmt="d", linewidths=0.5, ax=ax)
+    return fig
 
 def plot_heatmap(df):
     """Mapa de calor Región vs Categoría."""
     matriz = pd.crosstab(df["REGIÓN"], df["CATEGORÍA"])
+    mostrar_figura("app1.heatmap", matriz, _dibujar_heatmap, (10, 6))
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(matriz, cmap="YlGnBu", annot=True, fmt="d", linewidths=0.5, ax=ax)
-    st.pyplot(fig)
+def _dibujar_tendencia_anual(conteo, tamano):
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.lineplot(x=conteo.index, y=conteo.values, marker="o", color="#4E7F96", ax=ax)
+    return fig
 
 def plot_tendencia_anual(df):
     """Línea de tiempo: negocios por año."""
     conteo = df.groupby("AÑO").size()
-
-    fig, ax = plt.subplots(figsize=(7, 3))
-    sns.lineplot(x=conteo.index, y=conteo.values, marker="o", color="#4E7F96", ax=ax)
-    st.pyplot(fig)
+    mostrar_figura("app1.tendencia_anual", conteo, _dibujar_tendencia_anual, (7, 3))
 
 # ============================================================
 # Función principal de la app
@@ -494,20 +408,11 @@ def main():
         page_icon="♻️",
     )
 
-    # Ancho máximo del contenido
-    st.markdown(
-        "<style>.block-container {max-width: 900px;}</style>",
-        unsafe_allow_html=True,
-    )
-
-    # Cargar datos
-    df = load_data()
+    # Hoja de estilos (ancho máximo, banner, métricas) compuesta una vez
+    aplicar_estilos("app1.css", imagenes={"--banner": "img/verde2.png"})
 
-    # Clasificación Basura Cero
-    df["Tipo_Relacion_Basura_Cero"] = df.apply(tipo_relacion_basura_cero, axis=1)
-    df["Relacion_Basura_Cero"] = df["Tipo_Relacion_Basura_Cero"].apply(
-        lambda x: "Sí" if x != "No aplica" else "No"
-    )
+    # Cargar datos: vista del dataset compartido con la clasificación Basura Cero
+    df = load_data().vista(derivadas=COLUMNAS_BASURA_CERO)
 
     # ---------------------------------------------------------
     # 📌 Filtros en la barra lateral
@@ -515,22 +420,27 @@ def main():
 
     st.sidebar.header("Filtros")
 
-    regiones = sorted(df["REGIÓN"].unique())
-    departamentos = sorted(df["DEPARTAMENTO"].unique())
-    categorias = sorted(df["CATEGORÍA"].unique())
+    # Índice invertido: se construye una vez por versión de los datos
+    indice = indice_filtros(df, ("REGIÓN", "DEPARTAMENTO", "CATEGORÍA"))
+
+    regiones = indice.opciones("REGIÓN")
+    departamentos = indice.opciones("DEPARTAMENTO")
+    categorias = indice.opciones("CATEGORÍA")
 
     regiones_sel = st.sidebar.multiselect("Región", regiones, default=regiones)
     deptos_sel = st.sidebar.multiselect("Departamento", departamentos)
     categorias_sel = st.sidebar.multiselect("Categoría", categorias)
 
-    # Aplicar filtros
-    df_filtered = df[df["REGIÓN"].isin(regiones_sel)]
+    # Aplicar filtros: AND de máscaras del índice y un solo take
+    filtros = {"REGIÓN": regiones_sel}
 
     if deptos_sel:
-        df_filtered = df_filtered[df_filtered["DEPARTAMENTO"].isin(deptos_sel)]
+        filtros["DEPARTAMENTO"] = deptos_sel
 
     if categorias_sel:
-        df_filtered = df_filtered[df_filtered["CATEGORÍA"].isin(categorias_sel)]
+        filtros["CATEGORÍA"] = categorias_sel
+
+    df_filtered = indice.aplicar(df, indice.mascara(filtros))
 
     # ---------------------------------------------------------
     # Render de encabezado y resumen
@@ -560,7 +470,7 @@ def main():
     with col1:
         try:
             st.image(
-                "img/mapa_basura_cero.jpg",
+                imagen_liviana("img/mapa_basura_cero.jpg"),
                 caption="Fuente: Datos abiertos del Gobierno de Colombia (SSPD y MinVivienda, 2023–2024)",
                 use_container_width=True,
             )
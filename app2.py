@@ -15,16 +15,38 @@
 #   - Si ejecutas esto, asegúrate de que las imágenes en 'img/' existan o usa URLs públicas.
 # ============================================================
 
-import base64
 import re
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import seaborn as sns
 import streamlit as st
 
+from agregados import alineadas, conteo_marginal, cubo_agregado, resumen_alineacion, totales
+from cache_figuras import mostrar_figura, mostrar_plotly
+from canonico import REGLAS_DEPARTAMENTO, canonizar_serie
+from clasificador import COLUMNA_BITS, SIN_RELACION, ClasificadorBasuraCero
+from dataset import dataset_compartido
+from esquema import aplicar_esquema
+from estilos import aplicar_estilos
+from exportacion import botones_descarga
+from filtros import indice_filtros
+from graficos import (
+    TEMA_VERDE,
+    construir_autoridades,
+    construir_autoridades_apiladas,
+    construir_mapa_alineacion,
+    construir_relacion_alineacion,
+    dibujar_calor_regiones,
+    dibujar_relacion_categorias,
+    dibujar_sectores_verdes,
+    tamano_calor_regiones,
+)
+from recursos import imagen_liviana
+from utils import agregar_coordenadas
+
 
 DEPARTMENT_CANONICAL = {
     "AMAZONAS": "AMAZONAS",
@@ -81,43 +103,6 @@ DEPARTMENT_CANONICAL = {
     "VICHADA": "VICHADA",
 }
 
-DEPARTMENT_COORDS = {
-    "AMAZONAS": {"lat": -1.566, "lon": -72.640},
-    "ANTIOQUIA": {"lat": 7.1986, "lon": -75.3412},
-    "ARAUCA": {"lat": 6.5519, "lon": -70.9410},
-    "ATLÁNTICO": {"lat": 10.6966, "lon": -74.8741},
-    "BOGOTÁ, D.C.": {"lat": 4.6097, "lon": -74.0817},
-    "BOLÍVAR": {"lat": 9.1938, "lon": -74.9120},
-    "BOYACÁ": {"lat": 5.5450, "lon": -73.3678},
-    "CALDAS": {"lat": 5.2983, "lon": -75.2479},
-    "CAQUETÁ": {"lat": 0.8699, "lon": -73.8419},
-    "CASANARE": {"lat": 5.7589, "lon": -71.5724},
-    "CAUCA": {"lat": 2.4068, "lon": -76.7250},
-    "CESAR": {"lat": 9.3373, "lon": -73.6536},
-    "CHOCÓ": {"lat": 5.6947, "lon": -76.6583},
-    "CÓRDOBA": {"lat": 8.7496, "lon": -75.8735},
-    "CUNDINAMARCA": {"lat": 4.8143, "lon": -74.3540},
-    "GUAINÍA": {"lat": 2.5658, "lon": -68.5247},
-    "LA GUAJIRA": {"lat": 11.3548, "lon": -72.5205},
-    "GUAVIARE": {"lat": 1.8537, "lon": -72.9087},
-    "HUILA": {"lat": 2.9273, "lon": -75.2819},
-    "MAGDALENA": {"lat": 10.2373, "lon": -74.2064},
-    "META": {"lat": 3.4760, "lon": -73.7517},
-    "NARIÑO": {"lat": 1.2894, "lon": -77.3570},
-    "NORTE DE SANTANDER": {"lat": 7.9463, "lon": -72.8988},
-    "PUTUMAYO": {"lat": 0.4416, "lon": -76.6270},
-    "QUINDÍO": {"lat": 4.4610, "lon": -75.6674},
-    "RISARALDA": {"lat": 4.9820, "lon": -75.6039},
-    "SAN ANDRÉS, PROVIDENCIA Y SANTA CATALINA": {"lat": 12.5589, "lon": -81.7188},
-    "SANTANDER": {"lat": 6.6437, "lon": -73.6531},
-    "SUCRE": {"lat": 9.3164, "lon": -75.3972},
-    "TOLIMA": {"lat": 4.0925, "lon": -75.1545},
-    "VALLE DEL CAUCA": {"lat": 3.5297, "lon": -76.3035},
-    "VAUPÉS": {"lat": 0.8554, "lon": -70.8110},
-    "VICHADA": {"lat": 4.4234, "lon": -69.2878},
-}
-
-
 # ============================================================
 # 2️⃣ Clasificación: Relación con BASURA CERO
 # ============================================================
@@ -154,20 +139,8 @@ categorias_basura_cero = {
 }
 
 
-def tipo_relacion_basura_cero(fila: pd.Series) -> str:
-    """Clasifica una fila según su relación con el programa Basura Cero."""
-
-    descripcion = str(fila.get("DESCRIPCIÓN", "") or "").lower()
-    sector = str(fila.get("SECTOR", "") or "").lower()
-    subsector = str(fila.get("SUBSECTOR", "") or "").lower()
-    texto = f"{descripcion} {sector} {subsector}"
-
-    tipos_detectados: list[str] = []
-    for categoria, palabras in categorias_basura_cero.items():
-        if any(palabra in texto for palabra in palabras):
-            tipos_detectados.append(categoria)
-
-    return ", ".join(tipos_detectados) if tipos_detectados else "No aplica"
+# Palabras clave compiladas una sola vez para clasificar columnas completas.
+clasificador_basura_cero = ClasificadorBasuraCero(categorias_basura_cero)
 
 
 def tiene_relacion_basura_cero(valor: Optional[str]) -> bool:
@@ -176,25 +149,6 @@ def tiene_relacion_basura_cero(valor: Optional[str]) -> bool:
     texto = str(valor or "").strip().lower()
     return texto not in {"", "no aplica", "no disponible"}
 
-# ------------------------------------------------------------
-# 🌿 Función: Convertir imagen a base64 para usar en el banner
-# ------------------------------------------------------------
-def img_to_base64(img_path: str) -> Optional[str]:
-    """Convierte una imagen local en una cadena base64.
-
-    Si la imagen no existe, se devuelve ``None`` y se muestra
-    una advertencia en la interfaz.
-    """
-
-    try:
-        with open(img_path, "rb") as img_file:
-            b64_data = base64.b64encode(img_file.read()).decode()
-        return b64_data
-    except FileNotFoundError:
-        st.warning(f"Imagen no encontrada en {img_path}. Usando placeholder.")
-        return None
-
-
 # ------------------------------------------------------------
 # 📊 Función: Cargar y limpiar dataset de negocios verdes
 # ------------------------------------------------------------
@@ -213,134 +167,121 @@ def normalizar_region(valor: Optional[str]) -> Optional[str]:
     return texto
 
 
-def normalizar_departamento(valor: Optional[str]) -> Optional[str]:
-    """Devuelve el nombre canónico del departamento si es posible."""
-
-    if pd.isna(valor):
-        return valor
-
-    texto = str(valor).strip().upper()
-    texto = texto.replace(".", " ").replace(",", " ")
-    texto = re.sub(r"\s+", " ", texto)
-    sin_tildes = texto.translate(str.maketrans("ÁÉÍÓÚÜ", "AEIOUU"))
-
-    return DEPARTMENT_CANONICAL.get(sin_tildes, texto.title())
-
-
-def coordenadas_departamento(nombre: Optional[str]) -> Optional[dict[str, float]]:
-    """Obtiene las coordenadas del departamento con base en su nombre canónico."""
+# Departamento → nombre canónico con el diccionario de esta app (reglas de canonico.py);
+# los que no están en el diccionario quedan en formato título
+REGLAS_DEPARTAMENTO_APP = {
+    **REGLAS_DEPARTAMENTO,
+    "diccionario": DEPARTMENT_CANONICAL,
+    "respaldo": str.title,
+}
 
-    if pd.isna(nombre):
-        return None
 
-    clave = DEPARTMENT_CANONICAL.get(
-        str(nombre).strip().upper().translate(str.maketrans("ÁÉÍÓÚÜ", "AEIOUU")),
-        None,
-    )
-    if clave is None:
-        return None
+def limpiar_datos(df: pd.DataFrame) -> pd.DataFrame:
+    """Limpia el dataset crudo y lo prepara para su análisis."""
+
+    # Limpieza de nombres de columnas
+    renames = {col: col.split('\n')[0].strip() for col in df.columns if '\n' in col}
+    df = df.rename(columns=renames)
+    df.columns = df.columns.str.upper()
+
+    # Convertir a mayúsculas la columna PRODUCTO PRINCIPAL
+    df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].str.upper()
+    df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].str.replace(".", "", regex=False)
+    df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].replace("MIEL", "MIEL DE ABEJAS")
+
+    # Diccionario para corregir regiones según autoridad ambiental
+    mapeo_region = {
+        "AMVA": "ANDINA",
+        "CAM": "ANDINA",
+        "CAR": "ANDINA",
+        "CARDER": "ANDINA",
+        "CARDIQUE": "CARIBE",
+        "CARSUCRE": "CARIBE",
+        "CAS": "ANDINA",
+        "CDA": "AMAZONÍA",
+        "CDMB": "ANDINA",
+        "CODECHOCÓ": "PACÍFICA",
+        "CORALINA": "INSULAR",
+        "CORANTIOQUIA": "ANDINA",
+        "CORMACARENA": "ORINOQUÍA",
+        "CORNARE": "ANDINA",
+        "CORPAMAG": "CARIBE",
+        "CORPOAMAZONÍA": "AMAZONÍA",
+        "CORPOBOYACÁ": "ANDINA",
+        "CORPOCALDAS": "ANDINA",
+        "CORPOCESAR": "CARIBE",
+        "CORPOCHIVOR": "ANDINA",
+        "CORPOGUAJIRA": "CARIBE",
+        "CORPOGUAVIO": "ANDINA",
+        "CORPOMOJANA": "CARIBE",
+        "CORPONARIÑO": "PACÍFICA",
+        "CORPONOR": "CARIBE",
+        "CORPORINOQUÍA": "ORINOQUÍA",
+        "CORPOURABÁ": "PACÍFICA",
+        "CORTOLIMA": "ANDINA",
+        "CRA": "CARIBE",
+        "CRC": "PACÍFICA",
+        "CRQ": "ANDINA",
+        "CSB": "CARIBE",
+        "CVC": "PACÍFICA",
+        "CVS": "CARIBE",
+        "DADSA": "ANDINA",
+        "DAGMA": "ANDINA",
+        "EPA Barranquilla Verde": "CARIBE",
+        "EPA Buenaventura": "PACÍFICA",
+        "EPA Cartagena": "CARIBE",
+        "SDA": "ANDINA",
+    }
+
+    # Limpiar y asignar correctamente regiones, reemplazando "No registra"
+    df["AUTORIDAD AMBIENTAL"] = df["AUTORIDAD AMBIENTAL"].str.strip()
+    df["REGIÓN"] = df["REGIÓN"].str.strip()
+
+    def asignar_region(row: pd.Series) -> str:
+        if pd.isna(row["REGIÓN"]) or row["REGIÓN"].lower() == "no registra":
+            return mapeo_region.get(row["AUTORIDAD AMBIENTAL"], row["REGIÓN"])
+        return row["REGIÓN"]
+
+    df["REGIÓN"] = df.apply(asignar_region, axis=1)
+    df["REGIÓN"] = df["REGIÓN"].apply(normalizar_region)
+
+    if "DEPARTAMENTO" in df.columns:
+        df["DEPARTAMENTO"] = canonizar_serie(df["DEPARTAMENTO"], **REGLAS_DEPARTAMENTO_APP)
+
+    if "MUNICIPIO" in df.columns:
+        df["MUNICIPIO"] = df["MUNICIPIO"].str.strip().str.title()
+
+    def limpiar_numeros(texto: str) -> str:
+        if pd.isna(texto):
+            return texto
+        return re.sub(r"^\s*[\d\.]+\s*", "", texto)
+
+    for col in ["CATEGORÍA", "SECTOR", "SUBSECTOR"]:
+        if col in df.columns:
+            df[col] = df[col].apply(limpiar_numeros)
+
+    if "AÑO" in df.columns:
+        df["AÑO"] = df["AÑO"].astype(str).str.replace(",", "", regex=False)
+        df["AÑO"] = pd.to_numeric(df["AÑO"], errors="coerce").astype("Int64")
+
+    if {"DESCRIPCIÓN", "SECTOR", "SUBSECTOR"}.issubset(df.columns):
+        df["RELACIÓN BASURA CERO"], matriz = clasificador_basura_cero.clasificar(df)
+        df[COLUMNA_BITS] = clasificador_basura_cero.bits(matriz, index=df.index)
+    else:
+        df["RELACIÓN BASURA CERO"] = "No disponible"
 
-    return DEPARTMENT_COORDS.get(clave)
+    # Columnas de pocos valores → category (ver esquema.py)
+    return aplicar_esquema(df)
 
 
-@st.cache_data
 def load_and_clean_data(url: str) -> pd.DataFrame:
-    """Carga un dataset CSV, lo limpia y lo prepara para su análisis."""
+    """
+    Carga un dataset CSV (con caché Parquet local), lo limpia y lo prepara
+    para su análisis. Devuelve una vista del DataFrame compartido entre sesiones.
+    """
 
     try:
-        df = pd.read_csv(url)
-
-        # Limpieza de nombres de columnas
-        renames = {col: col.split('\n')[0].strip() for col in df.columns if '\n' in col}
-        df = df.rename(columns=renames)
-        df.columns = df.columns.str.upper()
-
-        # Convertir a mayúsculas la columna PRODUCTO PRINCIPAL
-        df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].str.upper()
-        df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].str.replace(".", "", regex=False)
-        df["PRODUCTO PRINCIPAL"] = df["PRODUCTO PRINCIPAL"].replace("MIEL", "MIEL DE ABEJAS")
-
-        # Diccionario para corregir regiones según autoridad ambiental
-        mapeo_region = {
-            "AMVA": "ANDINA",
-            "CAM": "ANDINA",
-            "CAR": "ANDINA",
-            "CARDER": "ANDINA",
-            "CARDIQUE": "CARIBE",
-            "CARSUCRE": "CARIBE",
-            "CAS": "ANDINA",
-            "CDA": "AMAZONÍA",
-            "CDMB": "ANDINA",
-            "CODECHOCÓ": "PACÍFICA",
-            "CORALINA": "INSULAR",
-            "CORANTIOQUIA": "ANDINA",
-            "CORMACARENA": "ORINOQUÍA",
-            "CORNARE": "ANDINA",
-            "CORPAMAG": "CARIBE",
-            "CORPOAMAZONÍA": "AMAZONÍA",
-            "CORPOBOYACÁ": "ANDINA",
-            "CORPOCALDAS": "ANDINA",
-            "CORPOCESAR": "CARIBE",
-            "CORPOCHIVOR": "ANDINA",
-            "CORPOGUAJIRA": "CARIBE",
-            "CORPOGUAVIO": "ANDINA",
-            "CORPOMOJANA": "CARIBE",
-            "CORPONARIÑO": "PACÍFICA",
-            "CORPONOR": "CARIBE",
-            "CORPORINOQUÍA": "ORINOQUÍA",
-            "CORPOURABÁ": "PACÍFICA",
-            "CORTOLIMA": "ANDINA",
-            "CRA": "CARIBE",
-            "CRC": "PACÍFICA",
-            "CRQ": "ANDINA",
-            "CSB": "CARIBE",
-            "CVC": "PACÍFICA",
-            "CVS": "CARIBE",
-            "DADSA": "ANDINA",
-            "DAGMA": "ANDINA",
-            "EPA Barranquilla Verde": "CARIBE",
-            "EPA Buenaventura": "PACÍFICA",
-            "EPA Cartagena": "CARIBE",
-            "SDA": "ANDINA",
-        }
-
-        # Limpiar y asignar correctamente regiones, reemplazando "No registra"
-        df["AUTORIDAD AMBIENTAL"] = df["AUTORIDAD AMBIENTAL"].str.strip()
-        df["REGIÓN"] = df["REGIÓN"].str.strip()
-
-        def asignar_region(row: pd.Series) -> str:
-            if pd.isna(row["REGIÓN"]) or row["REGIÓN"].lower() == "no registra":
-                return mapeo_region.get(row["AUTORIDAD AMBIENTAL"], row["REGIÓN"])
-            return row["REGIÓN"]
-
-        df["REGIÓN"] = df.apply(asignar_region, axis=1)
-        df["REGIÓN"] = df["REGIÓN"].apply(normalizar_region)
-
-        if "DEPARTAMENTO" in df.columns:
-            df["DEPARTAMENTO"] = df["DEPARTAMENTO"].apply(normalizar_departamento)
-
-        if "MUNICIPIO" in df.columns:
-            df["MUNICIPIO"] = df["MUNICIPIO"].str.strip().str.title()
-
-        def limpiar_numeros(texto: str) -> str:
-            if pd.isna(texto):
-                return texto
-            return re.sub(r"^\s*[\d\.]+\s*", "", texto)
-
-        for col in ["CATEGORÍA", "SECTOR", "SUBSECTOR"]:
-            if col in df.columns:
-                df[col] = df[col].apply(limpiar_numeros)
-
-        if "AÑO" in df.columns:
-            df["AÑO"] = df["AÑO"].astype(str).str.replace(",", "", regex=False)
-            df["AÑO"] = pd.to_numeric(df["AÑO"], errors="coerce").astype("Int64")
-
-        if {"DESCRIPCIÓN", "SECTOR", "SUBSECTOR"}.issubset(df.columns):
-            df["RELACIÓN BASURA CERO"] = df.apply(tipo_relacion_basura_cero, axis=1)
-        else:
-            df["RELACIÓN BASURA CERO"] = "No disponible"
-
-        return df
+        return dataset_compartido(url, limpiar_datos, precalentar=(cubo_agregado,)).vista()
     except Exception as exc:  # noqa: BLE001
         st.error(f"Error al cargar datos: {exc}. Verifica la URL.")
         return pd.DataFrame()
@@ -360,207 +301,29 @@ st.set_page_config(
 # ------------------------------------------------------------
 # 🎨 CSS personalizado (paleta inspirada en tonos verdes suaves y modernos)
 # ------------------------------------------------------------
-banner_image_path = "img/verde2.png"
-banner_inferior_image_path = "img/verde.png"
-img_col1_image_path = "img/baner_l.png"
-
-banner_base64 = img_to_base64(banner_image_path)
-banner_inferior_base64 = img_to_base64(banner_inferior_image_path)
-img_col1_base64 = img_to_base64(img_col1_image_path)
-
-st.markdown(
-    f"""
-<style>
-    [data-testid="stHeader"] {{
-        background: linear-gradient(90deg, #88C999, #A8E55A) !important;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }}
-    [data-testid="stHeader"] * {{
-        color: #1C3B2F !important;
-    }}
-    [data-testid="stAppViewContainer"], body {{
-        background-color: #E6FFF7 !important;
-        font-family: 'Arial', sans-serif;
-    }}
-    .stTitle {{
-        color: #1C7C54;
-        font-weight: bold;
-        text-align: center;
-    }}
-    .stText, .stMarkdown {{
-        color: #3C3C3C;
-        line-height: 1.6;
-    }}
-    .banner {{
-        position: relative;
-        width: 100%;
-        height: 250px;
-        background-image: url("data:image/jpg;base64,{banner_base64 if banner_base64 else ''}");
-        background-size: cover;
-        background-position: center;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 2em;
-        font-weight: bold;
-        color: white;
-        border-bottom: 3px solid #C9B79C;
-        padding: 20px;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        border-radius: 8px;
-        overflow: hidden;
-    }}
-    .banner::before {{
-        content: "";
-        position: absolute;
-        top: 0; left: 0;
-        width: 100%; height: 100%;
-        background: linear-gradient(45deg, rgba(0,0,0,0.3), rgba(0,0,0,0.1));
-        z-index: 0;
-    }}
-    .banner > * {{
-        position: relative;
-        z-index: 1;
-    }}
-    .banner-inferior {{
-        position: relative;
-        width: 100%;
-        height: 200px;
-        background-image: url("data:image/jpg;base64,{banner_inferior_base64 if banner_inferior_base64 else ''}");
-        background-size: cover;
-        background-position: center;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.5em;
-        font-weight: bold;
-        color: white;
-        border-top: 3px solid #C9B79C;
-        padding: 20px;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        border-radius: 8px;
-        overflow: hidden;
-        margin-top: 20px;
-    }}
-    .banner-inferior::before {{
-        content: "";
-        position: absolute;
-        top: 0; left: 0;
-        width: 100%; height: 100%;
-        background: linear-gradient(45deg, rgba(0,0,0,0.3), rgba(0,0,0,0.1));
-        z-index: 0;
-    }}
-    .banner-inferior > * {{
-        position: relative;
-        z-index: 1;
-    }}
-    .imagen-con-texto {{
-        position: relative;
-        width: 100%;
-        height: 300px;
-        background-image: url("data:image/jpg;base64,{img_col1_base64 if img_col1_base64 else ''}");
-        background-size: cover;
-        background-position: center;
-        border-radius: 8px;
-        overflow: hidden;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }}
-    .texto-superpuesto {{
-        position: absolute;
-        top: 50%;
-        left: 50%;
-        transform: translate(-50%, -50%);
-        color: white;
-        font-size: 1.2em;
-        font-weight: bold;
-        text-align: center;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.7);
-        z-index: 1;
-    }}
-    .imagen-con-texto::before {{
-        content: "";
-        position: absolute;
-        top: 0; left: 0;
-        width: 100%; height: 100%;
-        background: linear-gradient(45deg, rgba(0,0,0,0.3), rgba(0,0,0,0.1));
-        z-index: 0;
-    }}
-    button {{
-        background: linear-gradient(45deg, #A8E55A, #88C999);
-        color: #1C3B2F;
-        border: none;
-        padding: 12px 20px;
-        font-weight: bold;
-        cursor: pointer;
-        border-radius: 8px;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }}
-    button:hover {{
-        background: linear-gradient(45deg, #9CD25B, #7BBF8A);
-        color: #0F261D;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }}
-    .metric {{
-        background: #F0FFF4;
-        padding: 15px;
-        border-radius: 8px;
-        border-left: 5px solid #A8E55A;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        text-align: center;
-    }}
-    @media (max-width: 768px) {{
-        .banner {{
-            height: 150px;
-            font-size: 1.4em;
-        }}
-        .metric {{
-            padding: 10px;
-        }}
-    }}
-</style>
-""",
-    unsafe_allow_html=True,
+aplicar_estilos(
+    "app2.css",
+    imagenes={
+        "--banner": "img/verde2.png",
+        "--banner-inferior": "img/verde.png",
+        "--imagen-columna": "img/baner_l.png",
+    },
 )
 
 
 # ------------------------------------------------------------
 # 🛠️ Funciones de renderizado por sección
 # ------------------------------------------------------------
-def render_home(df: pd.DataFrame) -> None:
-    """Muestra la sección principal del dashboard."""
-
-    st.markdown(
-        """
-<div class="banner">
-    🌿 Residuos con propósito: Colombia hacia la Economía Circular 🌿
-</div>
-""",
-        unsafe_allow_html=True,
-    )
-
-    st.title("Integrando datos de Negocios Verdes, aprovechamiento y Ciencia, Tecnología e Innovación♻️")
-
-    st.markdown(
-        """
-¡Bienvenidos! 🌱  
-Este espacio presenta, de forma interactiva, cómo Colombia avanza hacia el objetivo **Basura Cero**, 
-transformando los residuos en oportunidades sostenibles.  
-
-Explora los mapas y gráficos para conocer los **proyectos activos**, las **inversiones por región** 
-y las **iniciativas empresariales verdes** que promueven una gestión responsable del ambiente.
-"""
-    )
-
-    st.markdown("")
+@st.fragment
+def render_presentacion() -> None:
+    """Imagen del mapa, texto y botón «¡Explora Más!» (un clic re-ejecuta solo este bloque)."""
 
     col1, col2 = st.columns([1, 2])
 
     with col1:
         try:
             st.image(
-                "img/mapa_basura_cero.jpg",
+                imagen_liviana("img/mapa_basura_cero.jpg"),
                 caption="Fuente: Datos abiertos del Gobierno de Colombia (SSPD y MinVivienda, 2023–2024)",
                 use_container_width=True,
             )
@@ -604,7 +367,13 @@ Explora el mapa para conocer en qué departamentos se están desarrollando los p
 """
         )
 
-    st.markdown("---")
+
+@st.fragment
+def render_metricas(df: pd.DataFrame) -> None:
+    """Tarjetas de total de negocios, sector líder y producto líder."""
+
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
 
     if not df.empty:
         col1, col2, col3 = st.columns(3)
@@ -615,7 +384,7 @@ Explora el mapa para conocer en qué departamentos se están desarrollando los p
             )
         with col2:
             top_sector = (
-                df["SECTOR"].value_counts().idxmax()
+                totales(cubo, "SECTOR").idxmax()
                 if "SECTOR" in df.columns and not df["SECTOR"].isna().all()
                 else "N/A"
             )
@@ -625,7 +394,7 @@ Explora el mapa para conocer en qué departamentos se están desarrollando los p
             )
         with col3:
             top_product = (
-                df["PRODUCTO PRINCIPAL"].value_counts().idxmax()
+                conteo_marginal(df, "PRODUCTO PRINCIPAL").idxmax()
                 if "PRODUCTO PRINCIPAL" in df.columns and not df["PRODUCTO PRINCIPAL"].isna().all()
                 else "N/A"
             )
@@ -634,123 +403,66 @@ Explora el mapa para conocer en qué departamentos se están desarrollando los p
                 unsafe_allow_html=True,
             )
 
-    if not df.empty and {"DEPARTAMENTO", "RELACIÓN BASURA CERO"}.issubset(df.columns):
-        mapa_df = df.copy()
-        relacion_normalizada = (
-            mapa_df["RELACIÓN BASURA CERO"].fillna("").astype(str).str.strip().str.lower()
-        )
-        mapa_df["TIENE_RELACION"] = ~relacion_normalizada.isin(
-            {"", "no aplica", "no disponible"}
-        )
 
-        resumen_departamentos = (
-            mapa_df.groupby("DEPARTAMENTO")
-            .agg(TOTAL=("DEPARTAMENTO", "size"), ALINEADOS=("TIENE_RELACION", "sum"))
-            .reset_index()
-        )
+@st.fragment
+def render_mapa_alineacion(df: pd.DataFrame) -> None:
+    """Mapa de intensidad Basura Cero por departamento."""
+
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
+
+    if not df.empty and {"DEPARTAMENTO", "RELACIÓN BASURA CERO"}.issubset(df.columns):
+        resumen_departamentos = resumen_alineacion(cubo, "DEPARTAMENTO")
         resumen_departamentos["ALINEADOS"] = resumen_departamentos["ALINEADOS"].astype(int)
         resumen_departamentos["PORCENTAJE"] = (
             resumen_departamentos["ALINEADOS"] / resumen_departamentos["TOTAL"]
         ) * 100
         resumen_departamentos["PORCENTAJE"] = resumen_departamentos["PORCENTAJE"].round(1)
-        resumen_departamentos["COORDS"] = resumen_departamentos["DEPARTAMENTO"].apply(
-            coordenadas_departamento
-        )
-        resumen_departamentos = resumen_departamentos.dropna(subset=["COORDS"])
+        # lat/lon (float64) unidas desde la tabla de coordenadas precalculada
+        resumen_departamentos = agregar_coordenadas(resumen_departamentos)
 
         if not resumen_departamentos.empty:
-            resumen_departamentos["lat"] = resumen_departamentos["COORDS"].apply(
-                lambda item: item["lat"]
-            )
-            resumen_departamentos["lon"] = resumen_departamentos["COORDS"].apply(
-                lambda item: item["lon"]
-            )
-
             st.markdown("### 🗺️ Mapa interactivo: intensidad Basura Cero por departamento")
-            fig_map = px.scatter_mapbox(
+            mostrar_plotly(
+                "inicio.mapa",
                 resumen_departamentos,
-                lat="lat",
-                lon="lon",
-                size="TOTAL",
-                size_max=45,
-                color="PORCENTAJE",
-                color_continuous_scale="Greens",
-                hover_name="DEPARTAMENTO",
-                hover_data={
-                    "TOTAL": True,
-                    "ALINEADOS": True,
-                    "PORCENTAJE": ":.1f",
-                    "lat": False,
-                    "lon": False,
-                },
-                zoom=4.2,
-                center={"lat": 4.5, "lon": -74.1},
-                mapbox_style="carto-positron",
-            )
-            fig_map.update_layout(
-                margin={"l": 0, "r": 0, "t": 0, "b": 0},
-                coloraxis_colorbar={"title": "% alineadas"},
+                construir_mapa_alineacion,
+                use_container_width=True,
             )
-            st.plotly_chart(fig_map, use_container_width=True)
             st.caption(
                 "El tamaño del marcador refleja el total de negocios verdes en el departamento "
                 "y el color indica el porcentaje con relación identificada al programa Basura Cero."
             )
 
-    st.markdown("")
 
-    if not df.empty and "SECTOR" in df.columns and not df["SECTOR"].isna().all():
-        st.markdown("### 🌿 Top 10 Sectores con más Negocios Verdes")
+@st.fragment
+def render_sectores(df: pd.DataFrame) -> None:
+    """Top 10 de sectores con más negocios verdes."""
 
-        custom_palette = [
-            "#E6FFF7",
-            "#B2F2E8",
-            "#66D1BA",
-            "#1FA88E",
-            "#0B5C4A",
-            "#A8E55A",
-            "#88C999",
-            "#C9B79C",
-            "#7BBF8A",
-            "#9CD25B",
-        ]
-
-        top_sectores = df["SECTOR"].value_counts().head(10)
-
-        sns.set_style("whitegrid")
-        plt.rcParams["font.family"] = "Arial"
-
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.barplot(
-            x=top_sectores.values,
-            y=top_sectores.index,
-            palette=custom_palette[: len(top_sectores)],
-            edgecolor="#0B5C4A",
-            ax=ax,
-        )
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
 
-        for container in ax.containers:
-            ax.bar_label(container, fmt="%d", padding=3, fontsize=9, color="#0B5C4A")
+    if not df.empty and "SECTOR" in df.columns and not df["SECTOR"].isna().all():
+        st.markdown("### 🌿 Top 10 Sectores con más Negocios Verdes")
 
-        ax.set_title(
-            "Top 10 Sectores con más Negocios Verdes",
-            fontsize=12,
-            weight="bold",
-            color="#0B5C4A",
-            pad=10,
+        top_sectores = totales(cubo, "SECTOR").head(10)
+        mostrar_figura(
+            "inicio.top_sectores", top_sectores, dibujar_sectores_verdes, (6, 4), **TEMA_VERDE
         )
-        ax.set_xlabel("Número de Negocios", fontsize=10, color="#0B5C4A")
-        ax.set_ylabel("Sector", fontsize=10, color="#0B5C4A")
-        sns.despine(left=True, bottom=True)
-        plt.tight_layout()
-
-        st.pyplot(fig)
     else:
         st.warning(
             "La columna 'SECTOR' no está presente, está vacía o no contiene datos válidos. "
             "No se puede generar la visualización. Verifica el dataset y la limpieza aplicada."
         )
 
+
+@st.fragment
+def render_relacion_basura_cero(df: pd.DataFrame) -> None:
+    """Relación con Basura Cero: proporción, categorías y mapa de calor por región."""
+
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
+
     if (
         not df.empty
         and "RELACIÓN BASURA CERO" in df.columns
@@ -766,148 +478,76 @@ agrupar los proyectos según su enfoque.
         )
 
         resumen_relacion = (
-            df["RELACIÓN BASURA CERO"]
-            .fillna("No aplica")
-            .apply(
-                lambda valor: (
-                    "Iniciativas alineadas"
-                    if str(valor).strip().lower()
-                    not in {"no aplica", "no disponible", ""}
-                    else "Sin relación identificada"
-                )
-            )
-            .value_counts()
+            cubo.groupby(
+                np.where(alineadas(cubo), "Iniciativas alineadas", "Sin relación identificada")
+            )["TOTAL"]
+            .sum()
+            .sort_values(ascending=False)
             .rename_axis("Relación")
             .reset_index(name="Total")
         )
 
         if not resumen_relacion.empty:
-            fig_relacion = px.pie(
+            mostrar_plotly(
+                "inicio.relacion",
                 resumen_relacion,
-                names="Relación",
-                values="Total",
-                color="Relación",
-                color_discrete_map={
-                    "Iniciativas alineadas": "#1FA88E",
-                    "Sin relación identificada": "#C9B79C",
-                },
-                hole=0.35,
-            )
-            fig_relacion.update_traces(
-                hovertemplate=(
-                    "<b>%{label}</b><br>Participación: %{percent}" "<br>Cantidad: %{value}<extra></extra>"
-                ),
-                textinfo="percent+label",
-                textposition="inside",
+                construir_relacion_alineacion,
+                use_container_width=True,
             )
-            fig_relacion.update_layout(margin=dict(l=0, r=0, t=30, b=0))
-
-            st.plotly_chart(fig_relacion, use_container_width=True)
         else:
             st.info(
                 "No se pudo calcular la proporción de iniciativas alineadas con el programa Basura Cero."
             )
 
-        relacion_series = (
-            df["RELACIÓN BASURA CERO"]
-            .fillna("No aplica")
-            .str.get_dummies(sep=", ")
-            .sum()
-            .sort_values(ascending=False)
-        )
+        relacion_series = pd.Series(dtype="int64")
+        if COLUMNA_BITS in cubo.columns:
+            # Suma por categoría sobre la columna de bits del cubo (sin re-partir textos)
+            relacion_series = clasificador_basura_cero.conteo(cubo[COLUMNA_BITS], cubo["TOTAL"])
+            relacion_series[SIN_RELACION] = int(cubo.loc[~alineadas(cubo), "TOTAL"].sum())
+            relacion_series = relacion_series[relacion_series > 0].sort_values(ascending=False)
 
         if not relacion_series.empty:
             st.markdown("#### Distribución general por categoría")
-            fig_rel, ax_rel = plt.subplots(figsize=(7, 4))
-            sns.barplot(
-                x=relacion_series.values,
-                y=relacion_series.index,
-                palette="Greens",
-                edgecolor="#0B5C4A",
-                ax=ax_rel,
-            )
-            ax_rel.set_xlabel("Número de iniciativas", fontsize=10, color="#0B5C4A")
-            ax_rel.set_ylabel("Categoría Basura Cero", fontsize=10, color="#0B5C4A")
-            ax_rel.set_title(
-                "Iniciativas clasificadas por su relación con Basura Cero",
-                fontsize=12,
-                weight="bold",
-                color="#0B5C4A",
-            )
-            for container in ax_rel.containers:
-                ax_rel.bar_label(
-                    container,
-                    fmt="%d",
-                    padding=3,
-                    fontsize=9,
-                    color="#0B5C4A",
-                )
-            sns.despine(left=True, bottom=True)
-            plt.tight_layout()
-            st.pyplot(fig_rel)
-
-        if "REGIÓN" in df.columns:
-            relacion_exploded = (
-                df.assign(
-                    **{
-                        "RELACIÓN BASURA CERO": df["RELACIÓN BASURA CERO"]
-                        .fillna("No aplica")
-                        .str.split(", ")
-                    }
-                )
-                .explode("RELACIÓN BASURA CERO")
-            )
-            relacion_exploded["RELACIÓN BASURA CERO"] = (
-                relacion_exploded["RELACIÓN BASURA CERO"].astype(str).str.strip()
-            )
-            relacion_exploded = relacion_exploded[
-                relacion_exploded["RELACIÓN BASURA CERO"].str.lower() != "no aplica"
-            ]
-
-            if not relacion_exploded.empty:
-                relacion_por_region = (
-                    relacion_exploded.groupby(["REGIÓN", "RELACIÓN BASURA CERO"])
-                    .size()
-                    .reset_index(name="TOTAL")
+            mostrar_figura(
+                "inicio.relacion_categorias",
+                relacion_series,
+                dibujar_relacion_categorias,
+                (7, 4),
+                **TEMA_VERDE,
+            )
+
+        if {"REGIÓN", COLUMNA_BITS}.issubset(cubo.columns):
+            # Región × categoría: conteos por combinación de bits, sin explode
+            pivot = clasificador_basura_cero.conteo_por_grupo(
+                cubo["REGIÓN"], cubo[COLUMNA_BITS], cubo["TOTAL"]
+            )
+            pivot = pivot.loc[pivot.sum(axis=1) > 0, pivot.sum() > 0].sort_index(axis=1)
+
+            if not pivot.empty:
+                st.markdown("#### Intensidad de categorías por región")
+                pivot = pivot.rename_axis(index="REGIÓN", columns="RELACIÓN BASURA CERO")
+
+                mostrar_figura(
+                    "inicio.calor_regiones",
+                    pivot,
+                    dibujar_calor_regiones,
+                    tamano_calor_regiones(pivot),
+                    **TEMA_VERDE,
                 )
 
-                if not relacion_por_region.empty:
-                    st.markdown("#### Intensidad de categorías por región")
-                    pivot = relacion_por_region.pivot(
-                        index="REGIÓN",
-                        columns="RELACIÓN BASURA CERO",
-                        values="TOTAL",
-                    ).fillna(0)
-
-                    fig_heat, ax_heat = plt.subplots(
-                        figsize=(8, max(3, 0.5 * len(pivot.index)))
-                    )
-                    sns.heatmap(
-                        pivot,
-                        cmap="Greens",
-                        annot=True,
-                        fmt=".0f",
-                        linewidths=0.5,
-                        cbar_kws={"label": "Número de iniciativas"},
-                        ax=ax_heat,
-                    )
-                    ax_heat.set_xlabel("Categoría Basura Cero", color="#0B5C4A", fontsize=10)
-                    ax_heat.set_ylabel("Región", color="#0B5C4A", fontsize=10)
-                    ax_heat.set_title(
-                        "Mapa de calor: enfoques Basura Cero por región",
-                        color="#0B5C4A",
-                        fontsize=12,
-                        weight="bold",
-                        pad=10,
-                    )
-                    plt.tight_layout()
-                    st.pyplot(fig_heat)
-
         st.info(
             "Puedes filtrar o ampliar esta clasificación ajustando el diccionario de palabras clave "
             "en la sección superior del script."
         )
 
+
+@st.fragment
+def render_autoridades(df: pd.DataFrame) -> None:
+    """Autoridades ambientales: totales y alineación con Basura Cero."""
+
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
+
     if (
         "AUTORIDAD AMBIENTAL" in df.columns
         and not df["AUTORIDAD AMBIENTAL"].isna().all()
@@ -921,7 +561,7 @@ las iniciativas con relación identificada a **Basura Cero**.
         )
 
         autoridades_norm = (
-            df["AUTORIDAD AMBIENTAL"]
+            cubo["AUTORIDAD AMBIENTAL"]
             .fillna("No registra")
             .astype(str)
             .str.strip()
@@ -929,48 +569,27 @@ las iniciativas con relación identificada a **Basura Cero**.
         )
 
         top_autoridades = (
-            autoridades_norm.value_counts()
+            totales(cubo.assign(**{"AUTORIDAD AMBIENTAL": autoridades_norm}), "AUTORIDAD AMBIENTAL")
             .head(15)
             .reset_index(name="Total")
-            .rename(columns={"index": "AUTORIDAD AMBIENTAL"})
             .sort_values("Total")
         )
 
         if not top_autoridades.empty:
-            fig_aut = px.bar(
+            mostrar_plotly(
+                "inicio.autoridades",
                 top_autoridades,
-                x="Total",
-                y="AUTORIDAD AMBIENTAL",
-                orientation="h",
-                color="Total",
-                color_continuous_scale="Greens",
-                text="Total",
-            )
-            fig_aut.update_traces(
-                hovertemplate=(
-                    "<b>%{y}</b><br>Total de iniciativas: %{x}<extra></extra>"
-                ),
-                textposition="outside",
-            )
-            fig_aut.update_layout(
-                coloraxis_showscale=False,
-                xaxis_title="Número de iniciativas registradas",
-                yaxis_title="Autoridad ambiental",
-                margin=dict(l=0, r=30, t=30, b=0),
+                construir_autoridades,
+                use_container_width=True,
             )
-            st.plotly_chart(fig_aut, use_container_width=True)
             st.caption(
                 "Las barras muestran las autoridades con mayor número de registros en el dataset."
             )
 
-        autoridades_df = df.assign(
+        autoridades_df = cubo.assign(
             AUTORIDAD_NORMALIZADA=autoridades_norm,
-            ESTADO_ALINEACIÓN=df["RELACIÓN BASURA CERO"].apply(
-                lambda valor: (
-                    "Iniciativas alineadas"
-                    if tiene_relacion_basura_cero(valor)
-                    else "Sin relación identificada"
-                )
+            ESTADO_ALINEACIÓN=np.where(
+                alineadas(cubo), "Iniciativas alineadas", "Sin relación identificada"
             ),
         )
 
@@ -978,8 +597,8 @@ las iniciativas con relación identificada a **Basura Cero**.
 
         distribucion_autoridad = (
             autoridades_df[autoridades_df["AUTORIDAD_NORMALIZADA"].isin(principales_autoridades)]
-            .groupby(["AUTORIDAD_NORMALIZADA", "ESTADO_ALINEACIÓN"])
-            .size()
+            .groupby(["AUTORIDAD_NORMALIZADA", "ESTADO_ALINEACIÓN"])["TOTAL"]
+            .sum()
             .reset_index(name="Total")
         )
 
@@ -992,82 +611,58 @@ las iniciativas con relación identificada a **Basura Cero**.
             orden_autoridades = (
                 top_autoridades.sort_values("Total", ascending=False)["AUTORIDAD AMBIENTAL"].tolist()
             )
-            fig_aut_stack = px.bar(
-                distribucion_autoridad,
-                x="Total",
-                y="AUTORIDAD_NORMALIZADA",
-                color="ESTADO_ALINEACIÓN",
-                orientation="h",
-                category_orders={"AUTORIDAD_NORMALIZADA": orden_autoridades},
-                color_discrete_map={
-                    "Iniciativas alineadas": "#1FA88E",
-                    "Sin relación identificada": "#C9B79C",
-                },
-                custom_data=["Porcentaje"],
-            )
-            fig_aut_stack.update_traces(
-                hovertemplate=(
-                    "<b>%{y}</b><br>%{color}<br>Total: %{x}<br>Participación: %{customdata[0]:.1f}%<extra></extra>"
-                )
-            )
-            fig_aut_stack.update_layout(
-                barmode="stack",
-                xaxis_title="Número de iniciativas",
-                yaxis_title="Autoridad ambiental",
-                legend_title="Estado de la relación",
-                margin=dict(l=0, r=30, t=30, b=0),
+            mostrar_plotly(
+                "inicio.autoridades_apiladas",
+                (distribucion_autoridad, tuple(orden_autoridades)),
+                construir_autoridades_apiladas,
+                use_container_width=True,
             )
-            st.plotly_chart(fig_aut_stack, use_container_width=True)
             st.caption(
                 "El gráfico apilado indica cuántas iniciativas de cada autoridad tienen relación identificada"
                 " con Basura Cero frente a las que aún no muestran esa alineación."
             )
 
+
+@st.fragment
+def render_explorador(df: pd.DataFrame) -> None:
+    """Tabla filtrable y descargas (los filtros re-ejecutan solo este bloque)."""
+
+    # Conteos precalculados una vez por versión del dataset (caché)
+    cubo = cubo_agregado(df)
+
     if not df.empty:
         with st.expander("📋 Ver Base de Datos Normalizada Completa"):
             st.markdown("#### Filtros de exploración")
 
-            filtered_df = df.copy()
+            # Índice invertido (una vez por versión); los filtros se combinan al final
+            indice = indice_filtros(df, ("REGIÓN", "SECTOR"))
+            filtros = {}
 
             if "REGIÓN" in df.columns:
-                regiones = sorted(
-                    region
-                    for region in df["REGIÓN"].dropna().unique().tolist()
-                    if str(region).strip()
-                )
+                regiones = indice.opciones("REGIÓN")
                 seleccion_regiones = st.multiselect(
                     "Selecciona regiones",
                     regiones,
                     help="Elige una o más regiones para focalizar la vista de la tabla.",
                 )
                 if seleccion_regiones:
-                    filtered_df = filtered_df[filtered_df["REGIÓN"].isin(seleccion_regiones)]
+                    filtros["REGIÓN"] = seleccion_regiones
 
             if "SECTOR" in df.columns:
-                sectores = sorted(
-                    sector
-                    for sector in df["SECTOR"].dropna().unique().tolist()
-                    if str(sector).strip()
-                )
+                sectores = indice.opciones("SECTOR")
                 seleccion_sectores = st.multiselect(
                     "Selecciona sectores",
                     sectores,
                     help="Delimita la tabla a los sectores de tu interés.",
                 )
                 if seleccion_sectores:
-                    filtered_df = filtered_df[filtered_df["SECTOR"].isin(seleccion_sectores)]
-
-            if "RELACIÓN BASURA CERO" in df.columns:
-                categorias_relacion = sorted(
-                    {
-                        categoria.strip()
-                        for valor in df["RELACIÓN BASURA CERO"].dropna()
-                        for categoria in str(valor).split(",")
-                        if categoria.strip()
-                        and categoria.strip().lower()
-                        not in {"no aplica", "no disponible"}
-                    }
-                )
+                    filtros["SECTOR"] = seleccion_sectores
+
+            mascara = indice.mascara(filtros)
+
+            if COLUMNA_BITS in cubo.columns:
+                conteo_categorias = clasificador_basura_cero.conteo(cubo[COLUMNA_BITS], cubo["TOTAL"])
+                categorias_relacion = sorted(conteo_categorias[conteo_categorias > 0].index)
                 seleccion_relacion = st.multiselect(
                     "Categorías Basura Cero",
                     categorias_relacion,
@@ -1077,30 +672,70 @@ las iniciativas con relación identificada a **Basura Cero**.
                     ),
                 )
                 if seleccion_relacion:
-                    mask_relacion = filtered_df["RELACIÓN BASURA CERO"].fillna("")
-                    mask_relacion = mask_relacion.apply(
-                        lambda texto: any(
-                            categoria in [valor.strip() for valor in str(texto).split(",")]
-                            for categoria in seleccion_relacion
-                        )
+                    mascara &= clasificador_basura_cero.mascara(
+                        df[COLUMNA_BITS], seleccion_relacion
                     )
-                    filtered_df = filtered_df[mask_relacion]
 
-            st.dataframe(filtered_df, use_container_width=True)
+            # Un único take con todas las máscaras combinadas
+            filtered_df = indice.aplicar(df, mascara)
+
+            # La columna de bits es interna: no se muestra ni se descarga
+            st.dataframe(filtered_df.drop(columns=COLUMNA_BITS, errors="ignore"), use_container_width=True)
             st.caption(
-                "La descarga incluye la base completa normalizada, independientemente de los filtros aplicados."
+                "Puedes descargar la base completa normalizada o solo la vista con los filtros aplicados."
             )
 
-            csv_full = df.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Descargar Base de Datos en CSV",
-                data=csv_full,
-                file_name="negocios_verdes_normalizados.csv",
-                mime="text/csv",
-            )
+            # Bytes en caché por versión del dataset (ver exportacion.py)
+            botones_descarga(df, "negocios_verdes_normalizados", mascara)
     else:
         st.warning("No se pudieron cargar los datos. Verifica la URL o la conexión a internet.")
 
+
+def render_home(df: pd.DataFrame) -> None:
+    """Muestra la sección principal del dashboard.
+
+    Cada bloque con gráficos o widgets es un ``st.fragment``: interactuar con
+    un widget re-ejecuta solo su bloque, no la página completa.
+    """
+
+    st.markdown(
+        """
+<div class="banner">
+    🌿 Residuos con propósito: Colombia hacia la Economía Circular 🌿
+</div>
+""",
+        unsafe_allow_html=True,
+    )
+
+    st.title("Integrando datos de Negocios Verdes, aprovechamiento y Ciencia, Tecnología e Innovación♻️")
+
+    st.markdown(
+        """
+¡Bienvenidos! 🌱  
+Este espacio presenta, de forma interactiva, cómo Colombia avanza hacia el objetivo **Basura Cero**, 
+transformando los residuos en oportunidades sostenibles.  
+
+Explora los mapas y gráficos para conocer los **proyectos activos**, las **inversiones por región** 
+y las **iniciativas empresariales verdes** que promueven una gestión responsable del ambiente.
+"""
+    )
+
+    st.markdown("")
+
+    render_presentacion()
+
+    st.markdown("---")
+
+    render_metricas(df)
+    render_mapa_alineacion(df)
+
+    st.markdown("")
+
+    render_sectores(df)
+    render_relacion_basura_cero(df)
+    render_autoridades(df)
+    render_explorador(df)
+
     st.markdown(
         """
 <div class="banner-inferior">
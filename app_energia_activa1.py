@@ -3,65 +3,108 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 
-ruta = 'https://github.com/juliandariogiraldoocampo/analisis_taltech/raw/refs/heads/main/explorador/Estado_de_la_prestaci%C3%B3n_del_servicio_de_energ%C3%ADa_en_Zonas_No_Interconectadas_20251021.csv'
-df = pd.read_csv(ruta)
-
-df['ENERGÍA REACTIVA'] = df['ENERGÍA REACTIVA'].str.replace(',', '').astype(float).astype(int)
-df['ENERGÍA ACTIVA'] = df['ENERGÍA ACTIVA'].str.replace(',', '').astype(float).astype(int)
-df['POTENCIA MÁXIMA'] = df['POTENCIA MÁXIMA'].str.replace(',', '').astype(float)
-
-lst_cambio = [['Á','A'],['É','E'], ['Í','I'], ['Ó','O'], ['Ú','U']]
-
-# Realizar los reemplazos en las columnas 'DEPARTAMENTO' y 'MUNICIPIO'
-for i in range(5):
-    df['DEPARTAMENTO'] = df['DEPARTAMENTO'].str.replace(lst_cambio[i][0],lst_cambio[i][1])
-    df['MUNICIPIO'] = df['MUNICIPIO'].str.replace(lst_cambio[i][0],lst_cambio[i][1])
-
-# Crear una condición negativa para filtrar los departamentos no deseados
-condicion_filtro = ~df['DEPARTAMENTO'].isin([
-'ARCHIPIELAGO DE SAN ANDRES',
-'ARCHIPIELAGO DE SAN ANDRES y PROVIDENCIA',
-'ARCHIPIELAGO DE SAN ANDRES, PROVIDENCIA Y SANTA CATALINA'
-])
-df_colombia_continental = df[condicion_filtro]
-
-df_agrupado = df_colombia_continental.groupby(['DEPARTAMENTO', 'MUNICIPIO'])[['ENERGÍA ACTIVA', 'ENERGÍA REACTIVA']].sum().reset_index()
-
-df_pivote = df_colombia_continental.pivot_table(
-    index = 'DEPARTAMENTO',
-    columns = 'AÑO SERVICIO',
-    values = ['ENERGÍA ACTIVA'],
-    aggfunc = 'sum'
-)
-
-# Cálculo de Total por Año de Energía Activa
-df_activa = df_colombia_continental.pivot_table(
-    columns = 'AÑO SERVICIO',
-    values = ['ENERGÍA ACTIVA'],
-    aggfunc = 'sum'
-).reset_index(drop=True)
-
-filas = df.shape[0]
-variables = df.shape[1]
-num_deptos = df['DEPARTAMENTO'].nunique()
-num_mpios = df['MUNICIPIO'].nunique()
-
-# Cálculo de Totales y Deltas
-tot_ac_25 = df_activa[2025].tolist()[0]
-tot_ac_24 = df_activa[2024].tolist()[0]
-tot_ac_23 = df_activa[2023].tolist()[0]
-tot_ac_22 = df_activa[2022].tolist()[0]
-tot_ac_21 = df_activa[2021].tolist()[0]
-delta_25 = (tot_ac_25 - tot_ac_24)/tot_ac_24*100
-delta_24 = (tot_ac_24 - tot_ac_23)/tot_ac_23*100
-delta_23 = (tot_ac_23 - tot_ac_22)/tot_ac_22*100
-delta_22 = (tot_ac_22 - tot_ac_21)/tot_ac_21*100
-
-
-# Ordenar departamentos por el año 2020 de mayor a menor
-df_depto_anios = df_colombia_continental.groupby(['DEPARTAMENTO', 'AÑO SERVICIO'])['ENERGÍA ACTIVA'].sum().reset_index()
-departamentos = df_depto_anios['DEPARTAMENTO'].unique().tolist()
+from cache_figuras import mostrar_plotly
+from estilos import aplicar_estilos
+from recursos import ANCHO_BANNER, imagen_liviana
+from agregados_zni import agregados_zni, cubo_energia, lista_departamentos, serie_departamento
+from data_loader_zni import load_zni
+from kpi_zni import formato_delta, indicadores, kpis_anuales
 
+# Dataset limpio (caché en disco + memoria) y agregados precalculados por versión
+df = load_zni(precalentar=(agregados_zni, cubo_energia, kpis_anuales))
+agregados = agregados_zni(df)
+cubo = cubo_energia(df)
+
+df_pivote = agregados['pivote']
+
+filas = agregados['resumen']['filas']
+variables = agregados['resumen']['columnas']
+num_deptos = agregados['resumen']['departamentos']
+num_mpios = agregados['resumen']['municipios']
+
+# Indicadores de los últimos 4 años con datos (totales y deltas en un solo groupby)
+indicadores_activa = indicadores(kpis_anuales(df), 'ENERGÍA ACTIVA', anios=4)
+
+
+# Departamentos en orden alfabético (cada uno con su serie por año ya calculada)
+departamentos = lista_departamentos(agregados)
+
+
+###############################################################################
+#          FIGURAS (construidas una vez por datos, ver cache_figuras)         #
+###############################################################################
+def barras_departamento(df_departamento):
+    # 1 Crear el objeto Figure
+    fig_barras = go.Figure()
+
+    # 2 Agregar las barras a fig_barras que es el objeto Figure
+    fig_barras.add_trace(go.Bar(
+        x=df_departamento['ENERGÍA ACTIVA'],
+        y=df_departamento['AÑO SERVICIO'].astype(str),
+        orientation='h',
+        marker_color='#4E7F96',
+        text=df_departamento['ENERGÍA ACTIVA'],
+        texttemplate='%{text:,.0f}',
+        textposition='auto',
+    ))
+
+    # 3. Actualizar el objeto Figure con el diseño deseado
+    fig_barras.update_layout(
+        height=400,
+        xaxis_title='Energía Activa (kWh)',
+        yaxis_title='Año',
+        showlegend=False,
+        yaxis={'categoryorder': 'category ascending'}
+    )
+    return fig_barras
+
+
+def linea_indicadores(df_activa):
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=df_activa.index,
+            y=df_activa.values,
+            mode='lines+markers',
+            line=dict(color="#4E7F96")
+            )
+    )
+    fig.update_layout(height=300)
+    return fig
+
+
+def barras_top_municipios(datos):
+    df_mayores, medida = datos
+    nombre = medida.title()
+
+    # 1. Crear el Objeto y agregar graficos
+    fig = px.bar(
+        df_mayores,
+        x = 'MUNICIPIO',
+        y = medida,
+        color = 'DEPARTAMENTO',
+        title = f'Top 5 Municipios - {nombre}',
+        labels = {'MUNICIPIO': 'Municipios', medida: f'{nombre} (kWh)', 'DEPARTAMENTO': 'Departamento'},
+        height=500
+    )
+
+    # 2. Actualización del diseño
+    fig.update_traces(
+        textposition='outside',
+        texttemplate='%{y:,.0f}'
+        )
+    return fig
+
+
+def torta_top_departamentos(datos):
+    df_depto, medida = datos
+    return px.pie(
+        df_depto,
+        names = 'DEPARTAMENTO',
+        values = medida,
+        title = f'Top 5 Departamentos - {medida.title()}',
+        hole=0.4
+    )
 
 
 ###############################################################################
@@ -70,16 +113,7 @@ departamentos = df_depto_anios['DEPARTAMENTO'].unique().tolist()
 st.set_page_config(
     page_title='⚡Zonas No Interconectadas',
     layout='centered')
-st.markdown(
-    '''
-    <style>
-        .block-container {
-        max-width: 1200px;
-        }
-
-    ''',
-    unsafe_allow_html=True
-)
+aplicar_estilos('zni1.css')
 
 
 # st.title('Dashboard Zonas No Interconectadas')
@@ -87,7 +121,7 @@ st.markdown(
 # st.subheader('Bootcamp Talento Tech')
 
 st.markdown('<a id="inicio"></a><br><br>', unsafe_allow_html=True)
-st.image('img/luz.png')
+st.image(imagen_liviana('img/luz.png', ANCHO_BANNER))
 ###############################################################################
 #                        TAMAÑO DEL CONJUNTO DE DATOS                         #
 ###############################################################################
@@ -132,86 +166,35 @@ with st.container(border=True):
         'Selecciona un departamento:',
         options=departamentos
     )
-    condicion_filtro = df_depto_anios['DEPARTAMENTO'] == depto_selec
-    df_departamento = df_depto_anios[condicion_filtro]
-
-    # Crear gráfico de barras horizontales
-    # 1 Crear el objeto Figure
-    fig_barras = go.Figure()
+    df_departamento = serie_departamento(agregados, depto_selec)
 
-    # 2 Agregar las barras a fig_barras que es el objeto Figure
-    fig_barras.add_trace(go.Bar(
-        x=df_departamento['ENERGÍA ACTIVA'],
-        y=df_departamento['AÑO SERVICIO'].astype(str),
-        orientation='h',
-        marker_color='#4E7F96',
-        text=df_departamento['ENERGÍA ACTIVA'],
-        texttemplate='%{text:,.0f}',
-        textposition='auto',
-    ))
-
-    # 3. Actualizar el objeto Figure con el diseño deseado
-    fig_barras.update_layout(
-        height=400,
-        xaxis_title='Energía Activa (kWh)',
-        yaxis_title='Año',
-        showlegend=False,
-        yaxis={'categoryorder': 'category ascending'}
+    # Barras horizontales por año (figura en caché por departamento)
+    mostrar_plotly(
+        'zni1.barras_departamento', df_departamento, barras_departamento, use_container_width=True
     )
 
-    # Mostrar
-    st.plotly_chart(fig_barras, use_container_width=True)
-
 ###############################################################################
 #           INDICADORES DE ENERGÍA ACTIVA POR AÑO EN MILLONES DE KWH          #
 ###############################################################################
 st.markdown('<a id="indicadores"></a><br><br>', unsafe_allow_html=True)
 with st.container(border=True):
     st.html('<font size=5><font color=#3D6E85>Indicadores de Energía Activa por año en Millones de kWh</font>')
-    col5, col6, col7, col8 = st.columns(4)
-    col5.metric(
-        label='2022',
-        value= round(tot_ac_22/1000000,2),
-        delta= f'{round(delta_22,2)}%',
-        help='Este es un valor de ejemplo',
-        border=True
-    )
-
-    col6.metric(
-        label='2023',
-        value= round(tot_ac_23/1000000,2),
-        delta= f'{round(delta_23,2)}%',
-        border=True
-    )
-
-    col7.metric(
-        label='2024',
-        value= round(tot_ac_24/1000000,2),
-        delta= f'{round(delta_24,2)}%',
-        border=True
-    )
-
-    col8.metric(
-        label='2025',
-        value= round(tot_ac_25/1000000,2),
-        delta= f'{round(delta_25,2)}%',
-        border=True
-    )
+    columnas_kpi = st.columns(len(indicadores_activa))
+    for i, (col, (anio, valor, delta)) in enumerate(zip(columnas_kpi, indicadores_activa.itertuples(index=False))):
+        col.metric(
+            label=str(anio),
+            value= round(valor/1000000,2),
+            delta= formato_delta(delta),
+            help='Este es un valor de ejemplo' if i == 0 else None,
+            border=True
+        )
 
     with st.container(border=True):
-        df_activa = df_activa[[2022,2023,2024,2025]].T
-
-        fig = go.Figure()
-        fig.add_trace(
-            go.Scatter(
-                x=df_activa.index,
-                y=df_activa[0],
-                mode='lines+markers',
-                line=dict(color="#4E7F96")
-                )
+        df_activa = indicadores_activa.set_index('AÑO')['VALOR']
+
+        mostrar_plotly(
+            'zni1.indicadores', df_activa, linea_indicadores, config = {'scrollZoom': False}
         )
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, config = {'scrollZoom': False})
         st.caption('*Fuente: Datos Abiertos del Gobierno Nacional de Colombia*')
 
 
@@ -225,55 +208,27 @@ with st.container(border=True):
     col9, col10 = st.columns(2)
 
     with col9:
-        # Del df_afrupado, odenamos por Energía Activa descendente y elegimos los 5 primeros
-        df_mayores = df_agrupado.sort_values(by='ENERGÍA ACTIVA', ascending=False).head(5)
-
-        # 1. Crear el Objeto y agregar graficos
-        fig = px.bar(
-            df_mayores,
-            x = 'MUNICIPIO',
-            y = 'ENERGÍA ACTIVA',
-            color = 'DEPARTAMENTO',
-            title = 'Top 5 Municipios - Energía Activa',
-            labels = {'MUNICIPIO': 'Municipios', 'ENERGÍA ACTIVA': 'Energía Activa (kWh)', 'DEPARTAMENTO': 'Departamento'},
-            #color_discrete_sequence=px.colors.sequential.Tealgrn,
-            height=500
+        # Top 5 municipios por Energía Activa, leído del cubo (sin ordenar la tabla completa)
+        df_mayores = cubo.top_municipios('ENERGÍA ACTIVA', n=5)
+
+        mostrar_plotly(
+            'zni1.top_municipios',
+            (df_mayores, 'ENERGÍA ACTIVA'),
+            barras_top_municipios,
+            use_container_width=True,
         )
 
-        # 2. Actualización del diseño
-        fig.update_traces(
-            textposition='outside',
-            texttemplate='%{y:,.0f}'
-            )
-
-        # 3. Mostrar
-        st.plotly_chart(fig, use_container_width=True)
-
         with col10:
-            # Del df_afrupado, odenamos por Energía Activa descendente y elegimos los 5 primeros
-            df_mayores = df_agrupado.sort_values(by='ENERGÍA REACTIVA', ascending=False).head(5)
-
-            # 1. Crear el Objeto y agregar graficos
-            fig = px.bar(
-                df_mayores,
-                x = 'MUNICIPIO',
-                y = 'ENERGÍA REACTIVA',
-                color = 'DEPARTAMENTO',
-                title = 'Top 5 Municipios - Energía Reactiva',
-                labels = {'MUNICIPIO': 'Municipios', 'ENERGÍA REACTIVA': 'Energía Reactiva (kWh)', 'DEPARTAMENTO': 'Departamento'},
-                #color_discrete_sequence=px.colors.sequential.Purpor,
-                height=500
+            # Top 5 municipios por Energía Reactiva, leído del cubo
+            df_mayores = cubo.top_municipios('ENERGÍA REACTIVA', n=5)
+
+            mostrar_plotly(
+                'zni1.top_municipios',
+                (df_mayores, 'ENERGÍA REACTIVA'),
+                barras_top_municipios,
+                use_container_width=True,
             )
 
-            # 2. Actualización del diseño
-            fig.update_traces(
-                textposition='outside',
-                texttemplate='%{y:,.0f}'
-                )
-
-            # 3. Mostrar
-            st.plotly_chart(fig, use_container_width=True)
-
 ###############################################################################
 #    GRAFICO TORTAS DE ENERGÍA ACTIVA Y REACTIVA POR AÑO EN MILLONES DE KWH   #
 ###############################################################################
@@ -283,38 +238,24 @@ with st.container(border=True):
 
     col11, col12 = st.columns(2)
     with col11:
-        df_depto_activa = df_agrupado.groupby('DEPARTAMENTO')['ENERGÍA ACTIVA'].sum().reset_index()
-        df_depto_activa = df_depto_activa.sort_values(by='ENERGÍA ACTIVA', ascending=False).head(5)
-
-         # 1. Crear el Objeto y agregar graficos
-        fig_act = px.pie(
-            df_depto_activa,
-            names = 'DEPARTAMENTO',
-            values = 'ENERGÍA ACTIVA',
-            title = 'Top 5 Departamentos - Energía Activa',
-            hole=0.4
-        )
-        # 2. Actualización del diseño
+        df_depto_activa = cubo.top_departamentos('ENERGÍA ACTIVA', n=5)
 
-        # 3. Mostrar
-        st.plotly_chart(fig_act, use_container_width=True)
+        mostrar_plotly(
+            'zni1.top_departamentos',
+            (df_depto_activa, 'ENERGÍA ACTIVA'),
+            torta_top_departamentos,
+            use_container_width=True,
+        )
 
     with col12:
-        df_depto_reactiva = df_agrupado.groupby('DEPARTAMENTO')['ENERGÍA REACTIVA'].sum().reset_index()
-        df_depto_reactiva = df_depto_reactiva.sort_values(by='ENERGÍA REACTIVA', ascending=False).head(5)
-
-         # 1. Crear el Objeto y agregar graficos
-        fig_react = px.pie(
-            df_depto_reactiva,
-            names = 'DEPARTAMENTO',
-            values = 'ENERGÍA REACTIVA',
-            title = 'Top 5 Departamentos - Energía Reactiva',
-            hole=0.4
-        )
-        # 2. Actualización del diseño
+        df_depto_reactiva = cubo.top_departamentos('ENERGÍA REACTIVA', n=5)
 
-        # 3. Mostrar
-        st.plotly_chart(fig_react, use_container_width=True)
+        mostrar_plotly(
+            'zni1.top_departamentos',
+            (df_depto_reactiva, 'ENERGÍA REACTIVA'),
+            torta_top_departamentos,
+            use_container_width=True,
+        )
 
 
 ###############################################################################
@@ -322,21 +263,6 @@ with st.container(border=True):
 ###############################################################################
 
 with st.sidebar.container():
-    st.markdown('''
-                <style>
-                [data-testid="stSidebar"] a {
-                    display: block;
-                    color: #3D6E85;
-                    text-decoration: none;
-                    padding: 10px 5px;
-                    border-radius: 6px;
-                }
-                [data-testid="stSidebar"] a:hover {
-                    background-color: #FFFFFF;
-                }
-                </style>
-                ''',
-                unsafe_allow_html=True)
     st.html('<font size=4><font color=#3D6E85>Menú de Navegación</font>')
     st.markdown('[Inicio](#inicio)')
     st.markdown('[Acerca de los Datos](#acerca-de)')
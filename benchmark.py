@@ -0,0 +1,366 @@
+# ============================================================
+# 📌 benchmark.py — Tiempos del pipeline (carga → limpieza → cubo → figuras)
+# ============================================================
+# Uso:  python benchmark.py                      → escalas 1×, 10× y 100×
+#       python benchmark.py --escalas 1 10       → solo algunas escalas
+#       python benchmark.py --comparar base.json → compara con otra corrida
+#
+# Funciona sin conexión y sin servidor de Streamlit: los datos son sintéticos
+# y solo se construyen las figuras (no se muestran).
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")  # Sin pantalla: las figuras solo se construyen
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from agregados import construir_cubo, resumen_alineacion, totales
+from agregados_zni import construir_agregados, lista_departamentos, serie_departamento
+from canonico import REGLAS_DEPARTAMENTO, REGLAS_MUNICIPIO, canonizar_serie
+from clasificador import COLUMNA_BITS, ClasificadorBasuraCero
+from config import DEPARTMENT_CANONICAL, MAPEO_REGION, categorias_basura_cero
+from data_loader import CACHE_DIR, clasificar_datos, normalizar_datos
+from data_loader_zni import REGLAS_ZNI, limpiar_zni
+from esquema import aplicar_esquema
+from graficos import figura_relacion_pie, figura_tendencia, figura_top_sectores
+
+
+# ============================================================
+# 📏 Tamaños de referencia
+# ============================================================
+
+# Filas aproximadas de las exportaciones reales (escala 1×)
+FILAS_REALES = {
+    "negocios_verdes": 4_000,
+    "zni": 10_000,
+    "canonizacion": 14_000,  # Departamentos y municipios de ambos datasets
+}
+
+ESCALAS = (1, 10, 100)
+
+
+# ============================================================
+# 🧪 Datos sintéticos (mismas columnas que los CSV reales)
+# ============================================================
+
+def _elegir(rng, valores, n, vacios=0.0):
+    """Muestra ``n`` valores; una fracción ``vacios`` queda en NaN."""
+    salida = rng.choice(np.array(valores, dtype=object), n)
+    salida[rng.random(n) < vacios] = np.nan
+    return salida
+
+
+def negocios_verdes_sinteticos(n, semilla=0):
+    """CSV crudo de negocios verdes con ``n`` filas (variantes de escritura incluidas)."""
+    rng = np.random.default_rng(semilla)
+
+    palabras = [p for lista in categorias_basura_cero.values() for p in lista]
+    palabras += ["miel", "café", "artesanías", "turismo", "madera", "cacao", "bordados", "servicio"]
+    descripcion = [
+        " ".join(rng.choice(palabras, 10)).capitalize() + f" · registro {i}" for i in range(n)
+    ]
+
+    autoridades = list(MAPEO_REGION) + [a.lower() for a in MAPEO_REGION][:10] + ["", "OTRA"]
+    departamentos = list(DEPARTMENT_CANONICAL) + ["Bogotá, D.C.", " narino ", "Valle"]
+
+    return pd.DataFrame({
+        "AÑO": _elegir(rng, ["2,019", "2,020", "2,021", "2,022", "2,023", "2024", "2025"], n, 0.02),
+        "AUTORIDAD AMBIENTAL": _elegir(rng, autoridades, n, 0.02),
+        "REGIÓN": _elegir(rng, ["Caribe", "ANDINA", "Pacífico", "Orinoquia", "Amazonía", "No registra"], n, 0.1),
+        "DEPARTAMENTO": _elegir(rng, departamentos, n, 0.02),
+        "MUNICIPIO": _elegir(rng, [f"Municipio {i}" for i in range(300)], n, 0.02),
+        "RAZÓN SOCIAL": [f"Negocio verde {i}" for i in range(n)],
+        "CATEGORÍA\n(tipo de bien o servicio)": _elegir(rng, [
+            "1. Bienes y servicios sostenibles provenientes de recursos naturales",
+            "2. Ecoproductos industriales",
+            "3. Mercado de carbono",
+        ], n, 0.02),
+        "SECTOR": _elegir(rng, [
+            "1.1 Biocomercio", "1.2. Agrosistemas sostenibles", "2.1 Aprovechamiento y valorización de residuos",
+            "2.2 Fuentes no convencionales de energía renovable", "2.3 Construcción sostenible", "Turismo de naturaleza",
+        ], n, 0.02),
+        "SUBSECTOR": _elegir(rng, [
+            "1.1.1 Ecoturismo", "1.2.1. Sistema de producción ecológico", "2.1.1 Reciclaje",
+            "Bioproductos", "Fotovoltaica", "Artesanías",
+        ], n, 0.05),
+        "PRODUCTO PRINCIPAL": _elegir(rng, ["Miel", "MIEL", "Café.", "Abono orgánico", "Artesanías", "Ecoturismo"], n, 0.02),
+        "DESCRIPCIÓN": _elegir(rng, descripcion, n, 0.03),
+    })
+
+
+def zni_sinteticos(n, semilla=0):
+    """CSV crudo de Zonas No Interconectadas con ``n`` filas (energía con separador de miles)."""
+    rng = np.random.default_rng(semilla)
+
+    departamentos = [
+        "AMAZONAS", "CAQUETÁ", "CAUCA", "CHOCÓ", "GUAINÍA", "GUAVIARE", "META", "NARIÑO",
+        "PUTUMAYO", "VAUPÉS", "VICHADA", "ARCHIPIELAGO DE SAN ANDRES, PROVIDENCIA Y SANTA CATALINA",
+    ]
+    activa = rng.gamma(2.0, 40_000, n)
+    reactiva = activa * rng.uniform(0.1, 0.5, n)
+
+    return pd.DataFrame({
+        "ID DEPARTAMENTO": rng.integers(5, 99, n),
+        "DEPARTAMENTO": _elegir(rng, departamentos, n),
+        "ID MUNICIPIO": rng.integers(5000, 99999, n),
+        "MUNICIPIO": _elegir(rng, [f"MUNICIPIO {i}" for i in range(90)] + ["LETICIA", "QUIBDÓ", "MITÚ"], n),
+        "ID LOCALIDAD": rng.integers(1, 10_000_000, n),
+        "LOCALIDAD": _elegir(rng, [f"LOCALIDAD {i}" for i in range(1500)], n),
+        "AÑO SERVICIO": rng.integers(2016, 2026, n),
+        "MES SERVICIO": rng.integers(1, 13, n),
+        "ENERGÍA ACTIVA": [f"{valor:,.2f}" for valor in activa],
+        "ENERGÍA REACTIVA": [f"{valor:,.2f}" for valor in reactiva],
+        "POTENCIA MÁXIMA": [f"{valor:,.2f}" for valor in activa / 300],
+        "PROMEDIO DIARIO EN HORAS": rng.uniform(2, 24, n).round(2),
+    })
+
+
+def nombres_sinteticos(n, semilla=0):
+    """Departamentos y municipios crudos de ambos datasets (espacios, tildes y Unicode descompuesto)."""
+    rng = np.random.default_rng(semilla)
+
+    variantes = list(DEPARTMENT_CANONICAL) + ["Bogotá, D.C.", " narino ", "Valle", "BOGOTA  D.C."]
+    variantes += [unicodedata.normalize("NFD", nombre) for nombre in ["CHOCÓ", "NARIÑO", "QUINDÍO"]]
+    municipios = [f"Municipio  {i} " for i in range(300)] + ["Quibdó", " Leticia", "Mitú"]
+    zni = zni_sinteticos(n, semilla)
+
+    return pd.DataFrame({
+        "DEPARTAMENTO NV": _elegir(rng, variantes, n, 0.02),
+        "MUNICIPIO NV": _elegir(rng, municipios, n, 0.02),
+        "DEPARTAMENTO ZNI": zni["DEPARTAMENTO"],
+        "MUNICIPIO ZNI": zni["MUNICIPIO"],
+    })
+
+
+def _a_csv(df):
+    return df.to_csv(index=False).encode("utf-8")
+
+
+# ============================================================
+# 🧩 Etapas del pipeline
+# ============================================================
+# Cada etapa recibe la salida de la anterior. El tiempo de copiar la
+# entrada (las etapas de limpieza modifican el DataFrame) no se mide.
+
+def leer_csv(contenido):
+    """Lectura del CSV crudo (en memoria, sin red)."""
+    return pd.read_csv(io.BytesIO(contenido))
+
+
+def agregaciones_home(df):
+    """Cubo y consultas que hace ``render_home`` (métricas, barras, mapa, heatmap)."""
+    cubo = construir_cubo(df)
+
+    for dimension in ("SECTOR", "REGIÓN", "DEPARTAMENTO", "AUTORIDAD AMBIENTAL"):
+        totales(cubo, dimension)
+    for dimension in ("REGIÓN", "DEPARTAMENTO", "AUTORIDAD AMBIENTAL"):
+        resumen_alineacion(cubo, dimension)
+
+    clasificador = ClasificadorBasuraCero()
+    clasificador.conteo(cubo[COLUMNA_BITS], cubo["TOTAL"])
+    clasificador.conteo_por_grupo(cubo["REGIÓN"], cubo[COLUMNA_BITS], cubo["TOTAL"])
+
+    return cubo
+
+
+def figuras_home(cubo):
+    """Figuras de ``graficos.py`` construidas a partir del cubo."""
+    figuras = [figura_top_sectores(cubo), figura_tendencia(cubo), figura_relacion_pie(cubo)]
+    plt.close("all")
+    return figuras
+
+
+def figuras_zni(agregados):
+    """Barras por departamento, línea anual y top 5 de municipios (apps de energía)."""
+    departamento = serie_departamento(agregados, lista_departamentos(agregados)[0])
+
+    barras = go.Figure(go.Bar(
+        x=departamento["ENERGÍA ACTIVA"],
+        y=departamento["AÑO SERVICIO"].astype(str),
+        orientation="h",
+    ))
+    activa = agregados["activa_por_anio"]
+    linea = go.Figure(go.Scatter(x=activa.index, y=activa.values, mode="lines+markers"))
+
+    top = [
+        px.bar(
+            agregados["por_municipio"].sort_values(by=col, ascending=False).head(5),
+            x="MUNICIPIO", y=col, color="DEPARTAMENTO",
+        )
+        for col in ["ENERGÍA ACTIVA", "ENERGÍA REACTIVA"]
+    ]
+    return [barras, linea, *top]
+
+
+def canonizar_nombres(df):
+    """Canonización de departamentos y municipios con las reglas de cada dataset."""
+    reglas = {
+        "DEPARTAMENTO NV": REGLAS_DEPARTAMENTO,
+        "MUNICIPIO NV": REGLAS_MUNICIPIO,
+        "DEPARTAMENTO ZNI": REGLAS_ZNI,
+        "MUNICIPIO ZNI": REGLAS_ZNI,
+    }
+    for col, regla in reglas.items():
+        df[col] = canonizar_serie(df[col], **regla)
+
+    return df
+
+
+PIPELINES = {
+    "negocios_verdes": (negocios_verdes_sinteticos, [
+        ("lectura", leer_csv),
+        ("normalizacion", normalizar_datos),
+        ("clasificacion", clasificar_datos),
+        ("esquema", aplicar_esquema),
+        ("agregacion", agregaciones_home),
+        ("figuras", figuras_home),
+    ]),
+    "zni": (zni_sinteticos, [
+        ("lectura", leer_csv),
+        ("normalizacion", limpiar_zni),
+        ("agregacion", construir_agregados),
+        ("figuras", figuras_zni),
+    ]),
+    "canonizacion": (nombres_sinteticos, [
+        ("lectura", leer_csv),
+        ("canonizacion", canonizar_nombres),
+    ]),
+}
+
+
+# ============================================================
+# ⏱ Medición
+# ============================================================
+
+def _copiar(valor):
+    return valor.copy() if isinstance(valor, pd.DataFrame) else valor
+
+
+def medir_pipeline(generar, etapas, filas, repeticiones):
+    """Tiempo por etapa (mínimo y mediana en segundos) y filas por segundo (mediana)."""
+    valor = _a_csv(generar(filas))
+    resultados = {}
+
+    for nombre, funcion in etapas:
+        tiempos = []
+        for _ in range(repeticiones):
+            entrada = _copiar(valor)
+            inicio = time.perf_counter()
+            salida = funcion(entrada)
+            tiempos.append(time.perf_counter() - inicio)
+
+        mediana = float(np.median(tiempos))
+        resultados[nombre] = {
+            "min_s": round(min(tiempos), 6),
+            "mediana_s": round(mediana, 6),
+            "filas_por_s": round(filas / mediana) if mediana > 0 else None,
+        }
+        valor = salida
+
+    return resultados
+
+
+def _commit():
+    """Commit actual (con ``+`` si hay cambios sin guardar), o None fuera de git."""
+    try:
+        raiz = Path(__file__).parent
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=raiz, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        cambios = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=raiz, capture_output=True, text=True
+        ).stdout.strip()
+        return commit + ("+" if cambios else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(escalas=ESCALAS, repeticiones=3, datasets=tuple(PIPELINES)):
+    """Corre todos los pipelines y devuelve el reporte (dict serializable a JSON)."""
+    reporte = {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "entorno": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "maquina": platform.machine(),
+        },
+        "repeticiones": repeticiones,
+        "resultados": [],
+    }
+
+    for dataset in datasets:
+        generar, etapas = PIPELINES[dataset]
+        for escala in escalas:
+            filas = FILAS_REALES[dataset] * escala
+            etapas_medidas = medir_pipeline(generar, etapas, filas, repeticiones)
+            reporte["resultados"].append({
+                "dataset": dataset,
+                "escala": escala,
+                "filas": filas,
+                "etapas": etapas_medidas,
+                "total_s": round(sum(e["mediana_s"] for e in etapas_medidas.values()), 6),
+            })
+            print(f"{dataset:>16} {escala:>4}× {filas:>9,} filas  {reporte['resultados'][-1]['total_s']:.3f} s")
+
+    return reporte
+
+
+def comparar(base, actual):
+    """Tabla (medianas) de la corrida ``actual`` frente a ``base``; razón > 1 = más lento."""
+    def indexar(reporte):
+        return {
+            (r["dataset"], r["escala"], etapa): valores["mediana_s"]
+            for r in reporte["resultados"]
+            for etapa, valores in r["etapas"].items()
+        }
+
+    antes, despues = indexar(base), indexar(actual)
+    comunes = [clave for clave in despues if clave in antes]
+
+    tabla = pd.DataFrame(comunes, columns=["dataset", "escala", "etapa"])
+    tabla["base_s"] = [antes[clave] for clave in comunes]
+    tabla["actual_s"] = [despues[clave] for clave in comunes]
+    tabla["razon"] = (tabla["actual_s"] / tabla["base_s"]).round(2)
+
+    return tabla
+
+
+# ============================================================
+# 🖥 CLI
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide cada etapa del pipeline con datos sintéticos.")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS), help="Múltiplos del tamaño real")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--datasets", nargs="+", choices=list(PIPELINES), default=list(PIPELINES))
+    parser.add_argument("--salida", type=Path, help="JSON de resultados (por defecto .cache/benchmarks/<commit>.json)")
+    parser.add_argument("--comparar", type=Path, metavar="BASE", help="JSON de otra corrida para comparar")
+    args = parser.parse_args()
+
+    reporte = ejecutar(args.escalas, args.repeticiones, args.datasets)
+
+    salida = args.salida or CACHE_DIR / "benchmarks" / f"{reporte['commit'] or 'sin-git'}.json"
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(reporte, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados en {salida}")
+
+    if args.comparar:
+        base = json.loads(args.comparar.read_text(encoding="utf-8"))
+        print(comparar(base, reporte).to_string(index=False))
@@ -0,0 +1,284 @@
+# ============================================================
+# 📌 cache_figuras.py — Figuras matplotlib/seaborn renderizadas una sola vez
+# ============================================================
+# Rasterizar con matplotlib es lo más costoso de cada vista. Aquí cada
+# gráfico se guarda como bytes PNG/SVG con la clave
+# (id del gráfico, hash de los datos agregados, tema, tamaño, formato);
+# mientras los datos no cambien, el rerun solo reenvía los bytes.
+# Las figuras Plotly siguen la misma idea: se construyen y se compactan
+# una vez por huella de datos (sección 📊 al final).
+
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import seaborn as sns
+import streamlit as st
+
+# Tope de memoria de la caché (MB); al superarlo se descartan las menos usadas
+MEGAS_FIGURAS = int(os.environ.get("DASHBOARD_FIGURAS_MB", 64))
+
+# Mismas opciones que usa ``st.pyplot`` al guardar la figura
+OPCIONES_GUARDADO = {"bbox_inches": "tight", "dpi": 200}
+
+# pyplot no es seguro entre hilos: se dibuja una figura a la vez
+_DIBUJO = threading.Lock()
+
+
+# ============================================================
+# 🔑 Huella de los datos de entrada
+# ============================================================
+
+def huella_datos(datos):
+    """Hash estable de un agregado (DataFrame, Series, arreglo o valores simples)."""
+    huella = hashlib.sha1()
+
+    if isinstance(datos, (pd.DataFrame, pd.Series)):
+        huella.update(pd.util.hash_pandas_object(datos, index=True).to_numpy().tobytes())
+        if isinstance(datos, pd.DataFrame):
+            forma = (list(datos.columns), datos.dtypes.astype(str).tolist())
+        else:
+            forma = (datos.name, str(datos.dtype))
+        huella.update(repr((forma, list(datos.index.names))).encode())
+    elif isinstance(datos, np.ndarray):
+        huella.update(datos.tobytes())
+        huella.update(repr((datos.dtype, datos.shape)).encode())
+    elif isinstance(datos, (tuple, list)):
+        for parte in datos:
+            huella.update(huella_datos(parte).encode())
+    else:
+        huella.update(repr(datos).encode())
+
+    return huella.hexdigest()
+
+
+# ============================================================
+# 🗃 Caché LRU con tope de memoria
+# ============================================================
+
+class CacheFiguras:
+    """
+    Bytes de figuras en orden de uso (LRU). Cuando el total supera
+    ``max_bytes`` se descartan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, clave, renderizar):
+        """Bytes de ``clave``; ``renderizar()`` solo se llama si no están en caché."""
+        with self._candado:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave]
+            self.fallos += 1
+
+        contenido = renderizar()
+
+        with self._candado:
+            if clave not in self._entradas and len(contenido) <= self.max_bytes:
+                self._entradas[clave] = contenido
+                self.bytes += len(contenido)
+
+                while self.bytes > self.max_bytes:
+                    _, descartado = self._entradas.popitem(last=False)
+                    self.bytes -= len(descartado)
+
+        return contenido
+
+    def estadisticas(self):
+        """Entradas, memoria usada (bytes), aciertos y fallos."""
+        with self._candado:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def cache_figuras():
+    """Caché de figuras compartida por todas las sesiones del servidor."""
+    return CacheFiguras(MEGAS_FIGURAS * 1024 * 1024)
+
+
+# ============================================================
+# 🖼 Render y visualización
+# ============================================================
+
+def renderizar(dibujar, datos, tamano, tema=None, rc=None, formato="png"):
+    """
+    Ejecuta ``dibujar(datos, tamano)`` (debe devolver una figura) con el
+    estilo de seaborn ``tema`` y los parámetros ``rc``, guarda la figura
+    en ``formato`` y la cierra. Retorna los bytes.
+    """
+    with _DIBUJO, sns.axes_style(tema), plt.rc_context(rc or {}):
+        fig = dibujar(datos, tamano)
+        try:
+            salida = io.BytesIO()
+            fig.savefig(salida, format=formato, **OPCIONES_GUARDADO)
+        finally:
+            plt.close(fig)
+
+    return salida.getvalue()
+
+
+def imagen_figura(id_grafico, datos, dibujar, tamano, tema=None, rc=None, formato="png"):
+    """
+    Bytes de la figura desde la caché. ``datos`` debe ser el agregado ya
+    calculado (pequeño): su hash forma parte de la clave.
+    """
+    clave = (
+        id_grafico,
+        huella_datos(datos),
+        tema,
+        tuple(sorted((rc or {}).items())),
+        tuple(tamano),
+        formato,
+    )
+    return cache_figuras().obtener(
+        clave, lambda: renderizar(dibujar, datos, tamano, tema, rc, formato)
+    )
+
+
+def mostrar_figura(id_grafico, datos, dibujar, tamano, tema=None, rc=None, formato="png"):
+    """Equivalente a ``st.pyplot(dibujar(datos, tamano))`` pero servido desde la caché."""
+    contenido = imagen_figura(id_grafico, datos, dibujar, tamano, tema, rc, formato)
+
+    if formato == "svg":
+        st.image(contenido.decode("utf-8"), width="stretch")
+    else:
+        st.image(contenido, width="stretch")
+
+
+# ============================================================
+# 📊 Figuras Plotly compactas
+# ============================================================
+
+# Decimales por defecto al redondear los arreglos de una figura Plotly
+DECIMALES_PLOTLY = 2
+
+# Referencias a columnas de customdata en hovertemplate/texttemplate
+_REF_CUSTOMDATA = re.compile(r"customdata\[(\d+)\]")
+
+
+def _decodificar(valor):
+    """Arreglo numpy de un valor Plotly (arreglo o dict base64 ``bdata``)."""
+    if isinstance(valor, dict):
+        arreglo = np.frombuffer(base64.b64decode(valor["bdata"]), dtype=valor["dtype"])
+        if "shape" in valor:
+            arreglo = arreglo.reshape([int(n) for n in str(valor["shape"]).split(",")])
+        return arreglo
+    return np.asarray(valor)
+
+
+def _es_arreglo(valor):
+    """Arreglos de datos (numpy o base64); las listas cortas del layout/dominio no se tocan."""
+    if isinstance(valor, dict):
+        return "bdata" in valor and "dtype" in valor
+    return isinstance(valor, np.ndarray)
+
+
+def compactar_arreglo(valor, decimales=DECIMALES_PLOTLY):
+    """
+    Arreglo numérico redondeado a ``decimales`` y con el tipo más pequeño:
+    los flotantes sin parte decimal pasan a enteros y los enteros al menor
+    ancho que los contiene. Lo que no es numérico se devuelve igual.
+    """
+    try:
+        arreglo = _decodificar(valor)
+    except (TypeError, ValueError):
+        return valor
+
+    if arreglo.dtype.kind == "f":
+        arreglo = np.round(arreglo, decimales)
+        if not (np.isfinite(arreglo).all() and (arreglo == np.trunc(arreglo)).all()):
+            return arreglo
+        arreglo = arreglo.astype(np.int64)
+    elif arreglo.dtype.kind not in "iu":
+        return valor
+
+    if arreglo.size == 0:
+        return arreglo
+    tipo = np.result_type(np.min_scalar_type(arreglo.min()), np.min_scalar_type(arreglo.max()))
+    return arreglo.astype(tipo) if tipo.kind in "iu" else arreglo
+
+
+def _podar_customdata(traza):
+    """Quita de ``customdata`` las columnas que las plantillas no usan (p. ej. lat/lon ocultas)."""
+    if "customdata" not in traza or not isinstance(traza.get("hovertemplate"), str):
+        return
+
+    plantillas = [traza["hovertemplate"], traza.get("texttemplate")]
+    plantillas = [p for p in plantillas if isinstance(p, str)]
+    datos = _decodificar(traza["customdata"])
+    if datos.ndim != 2 or any("customdata}" in p or "customdata:" in p for p in plantillas):
+        return
+
+    usadas = sorted({int(i) for p in plantillas for i in _REF_CUSTOMDATA.findall(p)})
+    if not usadas:
+        del traza["customdata"]
+        return
+
+    nuevo = {vieja: nueva for nueva, vieja in enumerate(usadas)}
+    for clave in ("hovertemplate", "texttemplate"):
+        if isinstance(traza.get(clave), str):
+            traza[clave] = _REF_CUSTOMDATA.sub(
+                lambda m: f"customdata[{nuevo[int(m.group(1))]}]", traza[clave]
+            )
+    traza["customdata"] = datos[:, usadas]
+
+
+def _compactar_dict(nodo, decimales):
+    for clave, valor in nodo.items():
+        if _es_arreglo(valor):
+            nodo[clave] = compactar_arreglo(valor, decimales)
+        elif isinstance(valor, dict):
+            _compactar_dict(valor, decimales)
+
+
+def minimizar_figura(fig, decimales=DECIMALES_PLOTLY):
+    """
+    Copia de ``fig`` con menos carga para el navegador: columnas de
+    ``customdata`` sin uso eliminadas y arreglos de las trazas redondeados
+    y reducidos de tipo (ver ``compactar_arreglo``). El layout no cambia.
+    """
+    spec = fig.to_dict()
+    for traza in spec["data"]:
+        _podar_customdata(traza)
+        _compactar_dict(traza, decimales)
+    return go.Figure(spec)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _plotly_en_cache(id_grafico, huella, decimales, _datos, _construir):
+    return minimizar_figura(_construir(_datos), decimales)
+
+
+def figura_plotly(id_grafico, datos, construir, decimales=DECIMALES_PLOTLY):
+    """
+    Figura de ``construir(datos)`` ya compactada, compartida entre sesiones
+    con la clave (id del gráfico, hash de ``datos``). ``construir`` debe
+    depender solo de ``datos``; la figura devuelta es de solo lectura.
+    """
+    return _plotly_en_cache(id_grafico, huella_datos(datos), decimales, datos, construir)
+
+
+def mostrar_plotly(id_grafico, datos, construir, decimales=DECIMALES_PLOTLY, **opciones):
+    """Equivalente a ``st.plotly_chart(construir(datos), **opciones)`` servido desde la caché."""
+    st.plotly_chart(figura_plotly(id_grafico, datos, construir, decimales), **opciones)
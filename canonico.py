@@ -0,0 +1,110 @@
+# ============================================================
+# 📌 canonico.py — Forma canónica de departamentos y municipios
+# ============================================================
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from config import DEPARTMENT_CANONICAL
+
+# Tildes, diéresis y demás marcas combinadas; la virgulilla solo sobre la N se conserva (Ñ)
+_MARCAS = re.compile(r"(?<![Nn])\u0303|[\u0300-\u0302\u0304-\u036f]")
+_ESPACIOS = re.compile(r"\s+")
+
+
+# ============================================================
+# 📐 Reglas por tipo de columna (argumentos de ``canonizar``)
+# ============================================================
+
+# Negocios Verdes: mayúsculas, sin puntos ni comas y con el nombre oficial
+REGLAS_DEPARTAMENTO = {
+    "mayusculas": True,
+    "signos": ".,",
+    "diccionario": DEPARTMENT_CANONICAL,
+}
+
+# Municipios: solo espacios (la escritura se conserva)
+REGLAS_MUNICIPIO = {}
+
+
+# ============================================================
+# 🔤 Un valor
+# ============================================================
+
+def plegar_tildes(texto):
+    """
+    Quita tildes y diéresis (Á → A, Ü → U) y conserva la Ñ. Funciona igual
+    con caracteres compuestos ('Á') o descompuestos ('A' + tilde).
+    """
+    if texto.isascii():
+        return texto
+
+    return unicodedata.normalize("NFC", _MARCAS.sub("", unicodedata.normalize("NFD", texto)))
+
+
+def canonizar(valor, mayusculas=False, signos="", plegar=False, diccionario=None, respaldo=None):
+    """
+    Forma canónica de un valor:
+
+    1. ``signos`` → espacio, espacios repetidos → uno, sin espacios a los lados
+    2. mayúsculas (``mayusculas``) y sin tildes (``plegar``)
+    3. nombre oficial de ``diccionario``, buscado con y sin tildes; si no
+       aparece se usa ``respaldo(texto)`` (o el texto tal cual)
+
+    Los faltantes devuelven ``pd.NA``.
+    """
+    if pd.isna(valor):
+        return pd.NA
+
+    texto = str(valor)
+    for signo in signos:
+        texto = texto.replace(signo, " ")
+    texto = _ESPACIOS.sub(" ", texto).strip()
+
+    if mayusculas:
+        texto = texto.upper()
+    if plegar:
+        texto = plegar_tildes(texto)
+
+    if diccionario is None:
+        return texto
+
+    canonico = diccionario.get(texto)
+    if canonico is None:
+        canonico = diccionario.get(plegar_tildes(texto))
+    if canonico is None:
+        canonico = respaldo(texto) if respaldo else texto
+
+    return canonico
+
+
+# ============================================================
+# 🧮 Una columna
+# ============================================================
+
+def canonizar_serie(serie, **reglas):
+    """
+    ``canonizar`` aplicada solo a los valores distintos de ``serie``; el
+    resultado vuelve a las filas con códigos categóricos (si la serie ya es
+    categórica se reutilizan sus códigos). Retorna una serie ``category``.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, unicos = serie.cat.codes.to_numpy(), serie.cat.categories
+    else:
+        codigos, unicos = pd.factorize(serie)
+
+    # Varios valores pueden dar el mismo nombre canónico → se vuelven a codificar
+    canonicos = pd.Series([canonizar(valor, **reglas) for valor in unicos], dtype=object)
+    recodigos, categorias = pd.factorize(canonicos)
+
+    # El código -1 (faltante) toma la última posición y sigue siendo -1
+    recodigos = np.append(recodigos, -1)
+
+    return pd.Series(
+        pd.Categorical.from_codes(recodigos[codigos], categorias),
+        index=serie.index,
+        name=serie.name,
+    )
@@ -0,0 +1,207 @@
+# ============================================================
+# 📌 clasificador.py — Clasificación Basura Cero vectorizada
+# ============================================================
+
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import categorias_basura_cero
+from utils import mapear_valores_unicos
+
+# Columnas cuyo texto se analiza (mismo orden que tipo_relacion_basura_cero)
+COLUMNAS_TEXTO = ("DESCRIPCIÓN", "SECTOR", "SUBSECTOR")
+
+# Etiqueta para registros sin ninguna categoría detectada
+SIN_RELACION = "No aplica"
+
+# Columna con las categorías empaquetadas en bits (uso interno, no se muestra)
+COLUMNA_BITS = "BASURA CERO BITS"
+
+# Por encima de este número de palabras la alternancia conjunta excede la
+# memoria del DFA de RE2 y se vuelve lenta; en ese caso no se usa prefiltro.
+MAX_PALABRAS_PREFILTRO = 500
+
+
+def _patron_literal(palabras):
+    """Une palabras clave en una alternancia regex (sintaxis RE2) de literales."""
+    return "|".join(re.sub(r"([\\.^$|?*+()\[\]{}])", r"\\\1", p) for p in palabras)
+
+
+def _minusculas(valor):
+    """Texto en minúsculas (NaN → 'nan', igual que el f-string original)."""
+    return str(valor).lower()
+
+
+# ============================================================
+# ♻ Clasificador reutilizable
+# ============================================================
+
+class ClasificadorBasuraCero:
+    """
+    Compila una sola vez el diccionario de palabras clave y clasifica
+    columnas completas con el motor de expresiones regulares de Arrow (RE2).
+
+    - Una alternancia con *todas* las palabras actúa como prefiltro: las filas
+      sin ninguna coincidencia (la mayoría "No aplica") se descartan en una pasada.
+    - Cada categoría tiene su propia alternancia compilada, que se evalúa solo
+      sobre las filas candidatas. RE2 recorre cada texto en tiempo lineal sin
+      importar cuántas palabras tenga la alternancia.
+
+    No se usa una única regex con grupos con nombre porque un recorrido de
+    izquierda a derecha consume las coincidencias solapadas (p. ej. "sostenible"
+    dentro de "transformación sostenible") y cambiaría las etiquetas.
+    """
+
+    def __init__(self, categorias=None):
+        categorias = categorias_basura_cero if categorias is None else categorias
+        if len(categorias) > 63:
+            raise ValueError("El clasificador admite como máximo 63 categorías.")
+
+        self.categorias = list(categorias)
+        self.dtype_bits = np.min_scalar_type((1 << len(self.categorias)) - 1)
+        self._patrones = [_patron_literal(palabras) for palabras in categorias.values()]
+
+        total_palabras = sum(len(palabras) for palabras in categorias.values())
+        self._prefiltro = (
+            "|".join(f"(?:{patron})" for patron in self._patrones)
+            if total_palabras <= MAX_PALABRAS_PREFILTRO
+            else None
+        )
+
+    # --------------------------------------------------------
+    # Preparación del texto
+    # --------------------------------------------------------
+    def texto(self, df, columnas=COLUMNAS_TEXTO):
+        """
+        Une las columnas de texto en minúsculas como un arreglo de Arrow.
+        La primera columna (descripción) casi no repite valores; las demás
+        se pasan a minúsculas una sola vez por valor distinto.
+        """
+        primera, *resto = columnas
+        partes = [df[primera].astype(str).str.lower()]
+        partes += [mapear_valores_unicos(df[col], _minusculas) for col in resto]
+
+        arreglos = [pa.array(parte.to_numpy(dtype=object), type=pa.string()) for parte in partes]
+        if len(arreglos) == 1:
+            return arreglos[0]
+
+        return pc.binary_join_element_wise(*arreglos, " ")
+
+    # --------------------------------------------------------
+    # Clasificación
+    # --------------------------------------------------------
+    def matriz(self, texto):
+        """Matriz multi-hot (filas × categorías) de coincidencias."""
+        matriz = np.zeros((len(texto), len(self.categorias)), dtype=bool)
+
+        if self._prefiltro is None:
+            candidatos, subconjunto = slice(None), texto
+        else:
+            candidatos = np.flatnonzero(
+                pc.match_substring_regex(texto, self._prefiltro).to_numpy(zero_copy_only=False)
+            )
+            if len(candidatos) == 0:
+                return matriz
+            subconjunto = texto.take(pa.array(candidatos))
+
+        for j, patron in enumerate(self._patrones):
+            matriz[candidatos, j] = pc.match_substring_regex(
+                subconjunto, patron
+            ).to_numpy(zero_copy_only=False)
+
+        return matriz
+
+    def codigos(self, matriz):
+        """Código entero por fila: el bit ``j`` indica la categoría ``j``."""
+        matriz = np.asarray(matriz)
+        pesos = np.left_shift(1, np.arange(matriz.shape[1], dtype=np.int64))
+        return matriz.astype(np.int64) @ pesos
+
+    def etiqueta(self, codigo):
+        """Etiqueta "Cat1, Cat2" (o "No aplica") de un código de bits."""
+        activas = [c for j, c in enumerate(self.categorias) if int(codigo) >> j & 1]
+        return ", ".join(activas) if activas else SIN_RELACION
+
+    def etiquetas(self, matriz, index=None):
+        """Etiqueta por fila, construida una sola vez por combinación distinta."""
+        posiciones, unicos = pd.factorize(self.codigos(matriz))
+        tabla = np.array([self.etiqueta(codigo) for codigo in unicos], dtype=object)
+
+        return pd.Series(tabla[posiciones], index=index)
+
+    def bits(self, matriz, index=None):
+        """Empaqueta la matriz multi-hot en un entero sin signo por fila (uint8 hasta 8 categorías)."""
+        return pd.Series(self.codigos(matriz).astype(self.dtype_bits), index=index, name=COLUMNA_BITS)
+
+    def clasificar(self, df, columnas=COLUMNAS_TEXTO):
+        """
+        Clasifica todas las filas de ``df``.
+
+        Retorna ``(etiquetas, matriz)``: la etiqueta separada por comas de cada
+        fila y un DataFrame booleano con una columna por categoría.
+        """
+        matriz = self.matriz(self.texto(df, columnas))
+
+        etiquetas = self.etiquetas(matriz, index=df.index)
+        multi_hot = pd.DataFrame(matriz, index=df.index, columns=self.categorias)
+
+        return etiquetas, multi_hot
+
+    # --------------------------------------------------------
+    # Consultas sobre la columna de bits
+    # --------------------------------------------------------
+    def _pesos(self):
+        return np.left_shift(np.uint64(1), np.arange(len(self.categorias), dtype=np.uint64))
+
+    def matriz_bits(self, bits):
+        """DataFrame booleano (una columna por categoría) a partir de la columna de bits."""
+        valores = np.asarray(bits, dtype=np.uint64)
+        return pd.DataFrame(
+            (valores[:, None] & self._pesos()) != 0,
+            index=getattr(bits, "index", None),
+            columns=self.categorias,
+        )
+
+    def conteo(self, bits, pesos=None):
+        """
+        Número de registros por categoría (suma por columnas de la matriz).
+        ``pesos`` permite contar sobre filas ya agregadas (p. ej. el cubo).
+        """
+        pesos = np.ones(len(bits), dtype=np.int64) if pesos is None else np.asarray(pesos)
+        tamanos = pd.Series(pesos).groupby(np.asarray(bits)).sum()
+
+        return self.matriz_bits(tamanos.index).mul(tamanos.to_numpy(), axis=0).sum()
+
+    def conteo_por_grupo(self, grupos, bits, pesos=None):
+        """
+        Tabla grupo × categoría con el número de registros de cada combinación.
+        Se agrupa por (grupo, bits) y solo se expanden las combinaciones distintas.
+        Los grupos vacíos (NaN) se descartan, como en ``groupby``.
+        """
+        pesos = np.ones(len(bits), dtype=np.int64) if pesos is None else np.asarray(pesos)
+        tamanos = (
+            pd.DataFrame(
+                {"grupo": np.asarray(grupos, dtype=object), "bits": np.asarray(bits), "pesos": pesos}
+            )
+            .groupby(["grupo", "bits"])["pesos"]
+            .sum()
+        )
+
+        matriz = self.matriz_bits(tamanos.index.get_level_values("bits"))
+        matriz = matriz.mul(tamanos.to_numpy(), axis=0)
+        matriz.index = tamanos.index.get_level_values("grupo")
+
+        return matriz.groupby(level=0).sum()
+
+    def mascara(self, bits, seleccion):
+        """True en las filas que pertenecen a alguna de las categorías seleccionadas."""
+        objetivo = 0
+        for categoria in seleccion:
+            if categoria in self.categorias:
+                objetivo |= 1 << self.categorias.index(categoria)
+
+        return (np.asarray(bits, dtype=np.uint64) & np.uint64(objetivo)) != 0
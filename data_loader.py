@@ -2,15 +2,34 @@
 # 📌 data_loader.py — Carga y limpieza del dataset
 # ============================================================
 
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import shutil
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 from utils import (
     normalizar_region,
-    normalizar_departamento,
+    normalizar_autoridad,
+    normalizar_producto,
+    limpiar_anio,
     limpiar_numeros,
-    tipo_relacion_basura_cero
+    mapear_valores_unicos
 )
+from canonico import REGLAS_DEPARTAMENTO, REGLAS_MUNICIPIO, canonizar_serie
+from clasificador import ClasificadorBasuraCero, COLUMNA_BITS
 from config import MAPEO_REGION
+from esquema import aplicar_esquema, reporte_memoria
 
 
 # ============================================================
@@ -24,14 +43,27 @@ DATA_URL = (
 
 
 # ============================================================
-# 🔄 Función principal de carga y limpieza
+# 🧩 Reglas por valor (se evalúan una vez por valor distinto)
 # ============================================================
 
-@st.cache_data(show_spinner=True)
-def load_data():
-    """Carga y limpia el dataset principal de negocios verdes."""
+def _region_faltante(region):
+    """True si la región está vacía o dice 'no registra'."""
+    return pd.isna(region) or str(region).lower() == "no registra"
+
+
+def _marca_basura_cero(relacion):
+    """'Sí' cuando la clasificación Basura Cero encontró alguna categoría."""
+    if pd.notna(relacion) and str(relacion).strip() != "" and str(relacion).lower() != "no aplica":
+        return "Sí"
+    return "No"
+
+
+# ============================================================
+# 🧹 Limpieza del dataset
+# ============================================================
 
-    df = pd.read_csv(DATA_URL)
+def normalizar_datos(df):
+    """Nombres de columna, años y textos normalizados (funciones de ``utils.py``)."""
 
     # Normalizar columnas
     df.columns = df.columns.str.upper().str.strip()
@@ -41,67 +73,475 @@ def load_data():
 
     # Convertir AÑO
     if "AÑO" in df.columns:
-        df["AÑO"] = (
-            df["AÑO"].astype(str).str.replace(",", "").replace("nan", pd.NA)
-        )
-        df["AÑO"] = pd.to_numeric(df["AÑO"], errors="coerce").astype("Int64")
+        df["AÑO"] = mapear_valores_unicos(df["AÑO"], limpiar_anio).astype("Int64")
 
     # Normalizar autoridad ambiental
     if "AUTORIDAD AMBIENTAL" in df.columns:
-        df["AUTORIDAD AMBIENTAL"] = (
-            df["AUTORIDAD AMBIENTAL"]
-            .astype(str)
-            .str.strip()
-            .str.upper()
-            .replace("", "NO REGISTRA")
+        df["AUTORIDAD AMBIENTAL"] = mapear_valores_unicos(
+            df["AUTORIDAD AMBIENTAL"], normalizar_autoridad
         )
 
     # Normalizar REGIÓN
     if "REGIÓN" in df.columns:
 
-        df["REGIÓN"] = df["REGIÓN"].apply(normalizar_region)
-
-        def asignar_region(row):
-            region = row["REGIÓN"]
-            autoridad = row["AUTORIDAD AMBIENTAL"]
+        region = mapear_valores_unicos(df["REGIÓN"], normalizar_region)
 
-            if pd.isna(region) or str(region).lower() == "no registra":
-                return MAPEO_REGION.get(autoridad, region)
+        # Región faltante o "no registra" → inferir desde la autoridad ambiental
+        if "AUTORIDAD AMBIENTAL" in df.columns:
+            sin_region = mapear_valores_unicos(region, _region_faltante).to_numpy(dtype=bool)
+            inferida = df["AUTORIDAD AMBIENTAL"].map(MAPEO_REGION)
+            region = pd.Series(
+                np.where(sin_region & inferida.notna(), inferida, region),
+                index=df.index,
+            )
 
-            return region
+        df["REGIÓN"] = region
 
-        df["REGIÓN"] = df.apply(asignar_region, axis=1)
-
-    # Normalizar DEPARTAMENTO
+    # Normalizar DEPARTAMENTO y MUNICIPIO (una vez por valor distinto, ver canonico.py)
     if "DEPARTAMENTO" in df.columns:
-        df["DEPARTAMENTO"] = df["DEPARTAMENTO"].apply(normalizar_departamento)
+        df["DEPARTAMENTO"] = canonizar_serie(df["DEPARTAMENTO"], **REGLAS_DEPARTAMENTO)
+
+    if "MUNICIPIO" in df.columns:
+        df["MUNICIPIO"] = canonizar_serie(df["MUNICIPIO"], **REGLAS_MUNICIPIO)
 
     # Limpiar texto en categorías
     for col in ["CATEGORÍA", "SECTOR", "SUBSECTOR"]:
         if col in df.columns:
-            df[col] = df[col].apply(limpiar_numeros)
+            df[col] = mapear_valores_unicos(df[col], limpiar_numeros)
 
     # Producto principal estandarizado
     if "PRODUCTO PRINCIPAL" in df.columns:
-        df["PRODUCTO PRINCIPAL"] = (
-            df["PRODUCTO PRINCIPAL"]
-            .astype(str)
-            .str.upper()
-            .str.replace(".", "", regex=False)
-            .replace({"MIEL": "MIEL DE ABEJAS"})
+        df["PRODUCTO PRINCIPAL"] = mapear_valores_unicos(
+            df["PRODUCTO PRINCIPAL"], normalizar_producto
         )
 
-    # Clasificación Basura Cero
+    return df
+
+
+def clasificar_datos(df):
+    """Columnas de la clasificación Basura Cero sobre un DataFrame ya normalizado."""
+
+    # Clasificación Basura Cero (etiqueta legible + categorías empaquetadas en bits)
     if set(["DESCRIPCIÓN", "SECTOR", "SUBSECTOR"]).issubset(df.columns):
-        df["RELACIÓN BASURA CERO"] = df.apply(tipo_relacion_basura_cero, axis=1)
+        clasificador = ClasificadorBasuraCero()
+        df["RELACIÓN BASURA CERO"], matriz = clasificador.clasificar(df)
+        df[COLUMNA_BITS] = clasificador.bits(matriz, index=df.index)
 
     # Columna SI / NO
-    df["BASURA 0"] = df["RELACIÓN BASURA CERO"].apply(
-        lambda x: "Sí"
-        if pd.notna(x)
-        and str(x).strip() != ""
-        and str(x).lower() != "no aplica"
-        else "No"
-    )
+    df["BASURA 0"] = mapear_valores_unicos(df["RELACIÓN BASURA CERO"], _marca_basura_cero)
 
     return df
+
+
+def limpiar_datos(df):
+    """Aplica toda la limpieza del dataset de negocios verdes a un DataFrame crudo."""
+    df = clasificar_datos(normalizar_datos(df))
+
+    # Columnas de pocos valores → category (ver esquema.py)
+    return aplicar_esquema(df)
+
+
+# ============================================================
+# 💾 Caché local en disco (Parquet)
+# ============================================================
+
+# Carpeta de la caché; puede moverse con la variable de entorno DASHBOARD_CACHE_DIR
+CACHE_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR", Path(__file__).parent / ".cache"))
+
+# Ingesta por bloques: filas por bloque (0 = leer el CSV completo de una vez).
+# Se activa con la variable de entorno DASHBOARD_FILAS_POR_BLOQUE o con --bloques.
+FILAS_POR_BLOQUE = int(os.environ.get("DASHBOARD_FILAS_POR_BLOQUE", 0))
+
+# Tramo de lectura al descargar o calcular el hash de la fuente
+_BYTES_POR_LECTURA = 1 << 20
+
+# Módulos cuyo código participa en la limpieza (si cambian, la caché se invalida)
+_MODULOS_LIMPIEZA = ("utils.py", "config.py", "clasificador.py", "esquema.py", "canonico.py")
+
+
+def _sha256(datos):
+    return hashlib.sha256(datos).hexdigest()
+
+
+def huella_codigo(limpiar):
+    """Hash del archivo que define ``limpiar`` más los módulos auxiliares."""
+    raiz = Path(__file__).parent
+    archivos = [Path(inspect.getsourcefile(limpiar))]
+    archivos += [raiz / nombre for nombre in _MODULOS_LIMPIEZA]
+
+    return _sha256(b"".join(archivo.read_bytes() for archivo in archivos))
+
+
+def _leer_fuente(url):
+    """Devuelve los bytes crudos del CSV (URL remota o ruta local)."""
+    if Path(url).exists():
+        return Path(url).read_bytes()
+
+    with urllib.request.urlopen(url) as respuesta:
+        return respuesta.read()
+
+
+def firma_fuente(url, anterior=None):
+    """
+    Firma para saber si la fuente cambió sin descargarla: (tamaño, fecha)
+    de un archivo local o (ETag, Last-Modified) de una URL con un HEAD
+    condicional. Si el servidor responde 304 se devuelve ``anterior``;
+    None si la URL no trae ninguna de las dos cabeceras.
+    """
+    ruta = Path(url)
+    if ruta.exists():
+        estado = ruta.stat()
+        return estado.st_size, estado.st_mtime_ns
+
+    cabeceras = {}
+    if anterior:
+        etag, modificado = anterior
+        if etag:
+            cabeceras["If-None-Match"] = etag
+        if modificado:
+            cabeceras["If-Modified-Since"] = modificado
+
+    peticion = urllib.request.Request(url, method="HEAD", headers=cabeceras)
+    try:
+        with urllib.request.urlopen(peticion, timeout=30) as respuesta:
+            firma = (respuesta.headers.get("ETag"), respuesta.headers.get("Last-Modified"))
+    except urllib.error.HTTPError as error:
+        if error.code == 304:
+            return anterior
+        raise
+
+    return firma if any(firma) else None
+
+
+def _fuente_en_disco(url, destino):
+    """
+    Ruta local del CSV. Las URL se descargan a ``destino`` por tramos,
+    sin cargar el archivo completo en memoria.
+    """
+    if Path(url).exists():
+        return Path(url)
+
+    with urllib.request.urlopen(url) as respuesta, open(destino, "wb") as archivo:
+        shutil.copyfileobj(respuesta, archivo, _BYTES_POR_LECTURA)
+
+    return destino
+
+
+def _sha256_archivo(ruta):
+    """Mismo hash que ``_sha256`` pero leyendo el archivo por tramos."""
+    huella = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for tramo in iter(lambda: archivo.read(_BYTES_POR_LECTURA), b""):
+            huella.update(tramo)
+
+    return huella.hexdigest()
+
+
+def _escribir_atomico(destino, escribir):
+    """Escribe en un archivo temporal y lo renombra para no dejar archivos a medias."""
+    temporal = destino.with_name(destino.name + ".tmp")
+    escribir(temporal)
+    os.replace(temporal, destino)
+
+
+def _directorio_cache(limpiar):
+    """Cada función de limpieza (cada app) tiene su propia carpeta de caché."""
+    return CACHE_DIR / Path(inspect.getsourcefile(limpiar)).stem
+
+
+# ============================================================
+# 🚰 Ingesta por bloques
+# ============================================================
+
+def _tipos_lectura(ruta, filas):
+    """
+    Tipos de columna deducidos de la primera muestra del CSV. Se fijan para
+    todos los bloques, así un bloque sin vacíos no cambia int ↔ float.
+    """
+    muestra = pd.read_csv(ruta, nrows=filas)
+    tipos = {}
+
+    for col, tipo in muestra.dtypes.items():
+        if pd.api.types.is_bool_dtype(tipo):
+            tipos[col] = "boolean"
+        elif pd.api.types.is_integer_dtype(tipo):
+            tipos[col] = "Int64"
+        elif not pd.api.types.is_float_dtype(tipo) or muestra[col].isna().all():
+            tipos[col] = object
+
+    return tipos
+
+
+def _esquema_arrow(bloque):
+    """
+    Esquema Parquet fijo a partir del primer bloque limpio: las categóricas
+    se guardan como diccionario (cada bloque con el suyo) y las columnas
+    que llegaron vacías, como texto.
+    """
+    esquema = pa.Schema.from_pandas(bloque, preserve_index=False)
+    campos = []
+
+    for campo in esquema:
+        if pa.types.is_dictionary(campo.type):
+            campo = campo.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_null(campo.type):
+            campo = campo.with_type(pa.string())
+        campos.append(campo)
+
+    # Los metadatos de pandas conservan los tipos (Int64, category...) al leer
+    return pa.schema(campos, metadata=esquema.metadata)
+
+
+def _prefijo_comun(a, b):
+    """Tramo inicial que comparten dos listas."""
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return a[:n]
+
+
+def limpiar_por_bloques(ruta, limpiar, destino, filas_por_bloque):
+    """
+    Lee el CSV de ``ruta`` en bloques de ``filas_por_bloque`` filas, limpia
+    cada bloque con ``limpiar`` y lo agrega al Parquet ``destino``.
+    La memoria máxima depende del tamaño del bloque, no del archivo.
+
+    Retorna lo necesario para que la lectura quede igual a la carga completa:
+
+    - ``categorias``: orden de cada columna categórica; el tramo que todos
+      los bloques comparten al inicio (la lista fija del esquema) y luego
+      el resto en orden alfabético
+    - ``enteros``: columnas leídas como Int64 solo por fijar los tipos
+    """
+    tipos = _tipos_lectura(ruta, filas_por_bloque)
+    escritor = None
+    prefijos, vistas = {}, {}
+
+    try:
+        for bloque in pd.read_csv(ruta, chunksize=filas_por_bloque, dtype=tipos):
+            bloque = limpiar(bloque)
+
+            if escritor is None:
+                esquema = _esquema_arrow(bloque)
+                escritor = pq.ParquetWriter(destino, esquema)
+
+            for col in bloque.columns:
+                if isinstance(bloque[col].dtype, pd.CategoricalDtype):
+                    categorias = bloque[col].cat.categories.tolist()
+                    prefijos[col] = _prefijo_comun(prefijos.get(col, categorias), categorias)
+                    vistas.setdefault(col, set()).update(categorias)
+
+            escritor.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    return {
+        "categorias": {
+            col: prefijo + sorted(vistas[col].difference(prefijo), key=str)
+            for col, prefijo in prefijos.items()
+        },
+        "enteros": [
+            campo.name for campo in esquema
+            if tipos.get(campo.name) == "Int64" and campo.type == pa.int64()
+        ] if escritor is not None else [],
+    }
+
+
+def _ruta_bloques(archivo):
+    """Ajustes de lectura de un Parquet escrito por bloques (junto al archivo)."""
+    return archivo.with_suffix(".bloques.json")
+
+
+def _leer_parquet(archivo, version):
+    """
+    Lee el Parquet limpio. Un archivo escrito por bloques une los diccionarios
+    en orden de llegada y guarda enteros como Int64; se ajustan con lo
+    registrado al escribirlo para quedar igual a la carga completa.
+    """
+    df = pd.read_parquet(archivo)
+
+    try:
+        ajustes = json.loads(_ruta_bloques(archivo).read_text(encoding="utf-8"))
+    except OSError:
+        ajustes = {}  # Carga completa: el Parquet ya trae los tipos
+
+    for col, categorias in ajustes.get("categorias", {}).items():
+        if col in df.columns:
+            df[col] = df[col].cat.set_categories(categorias)
+
+    for col in ajustes.get("enteros", []):
+        if col in df.columns:
+            # Como read_csv: int64 sin vacíos, float64 con vacíos
+            df[col] = df[col].astype("float64" if df[col].hasnans else "int64")
+
+    df.attrs["version"] = version
+    return df
+
+
+def construir_cache(url, limpiar, filas_por_bloque=None):
+    """
+    Descarga la fuente, la limpia y guarda el resultado en Parquet.
+    Si ya existe un Parquet para los mismos bytes y el mismo código,
+    se reutiliza sin volver a limpiar. Con ``filas_por_bloque`` la
+    descarga y la limpieza se hacen por tramos.
+
+    Retorna ``(archivo, version, df)``; ``df`` es None si no se cargó en memoria.
+    """
+    directorio = _directorio_cache(limpiar)
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    descarga = directorio / "fuente.csv.tmp"
+    df = None
+
+    try:
+        if filas_por_bloque:
+            fuente = _fuente_en_disco(url, descarga)
+            huella = _sha256_archivo(fuente)
+        else:
+            datos = _leer_fuente(url)
+            huella = _sha256(datos)
+
+        version = f"{huella[:16]}-{huella_codigo(limpiar)[:16]}"
+        archivo = directorio / f"{version}.parquet"
+
+        if not archivo.exists():
+            if filas_por_bloque:
+                ajustes = {}
+                _escribir_atomico(
+                    archivo,
+                    lambda ruta: ajustes.update(
+                        limpiar_por_bloques(fuente, limpiar, ruta, filas_por_bloque)
+                    ),
+                )
+                _escribir_atomico(
+                    _ruta_bloques(archivo),
+                    lambda ruta: ruta.write_text(json.dumps(ajustes, ensure_ascii=False), encoding="utf-8"),
+                )
+            else:
+                df = limpiar(pd.read_csv(io.BytesIO(datos)))
+                df.attrs["version"] = version
+                _escribir_atomico(archivo, df.to_parquet)
+
+            # Las versiones anteriores ya no sirven
+            for viejo in [*directorio.glob("*.parquet"), *directorio.glob("*.bloques.json")]:
+                if viejo not in (archivo, _ruta_bloques(archivo)):
+                    viejo.unlink(missing_ok=True)
+    finally:
+        descarga.unlink(missing_ok=True)
+
+    manifiesto = {"url": url, "version": version, "archivo": archivo.name}
+    _escribir_atomico(
+        directorio / "manifiesto.json",
+        lambda ruta: ruta.write_text(json.dumps(manifiesto, indent=2), encoding="utf-8"),
+    )
+
+    return archivo, version, df
+
+
+def actualizar_cache(url, limpiar, filas_por_bloque=None, version_actual=None):
+    """
+    Reconstruye (o reutiliza) la caché en disco y devuelve el DataFrame
+    limpio; None si la versión resultante es ``version_actual`` (la fuente
+    no cambió y no hace falta volver a leerla).
+    """
+    if filas_por_bloque is None:
+        filas_por_bloque = FILAS_POR_BLOQUE
+
+    archivo, version, df = construir_cache(url, limpiar, filas_por_bloque)
+    if version == version_actual:
+        return None
+    return df if df is not None else _leer_parquet(archivo, version)
+
+
+def cargar_con_cache(url, limpiar):
+    """
+    Carga el dataset limpio desde la caché en disco si sigue siendo válida
+    (mismo código de limpieza); si no, lo descarga y reconstruye.
+    """
+    directorio = _directorio_cache(limpiar)
+    manifiesto = directorio / "manifiesto.json"
+
+    try:
+        info = json.loads(manifiesto.read_text(encoding="utf-8"))
+        vigente = (
+            info["url"] == url
+            and info["version"].endswith(huella_codigo(limpiar)[:16])
+        )
+        if vigente:
+            return _leer_parquet(directorio / info["archivo"], info["version"])
+    except (OSError, ValueError, KeyError):
+        pass  # Sin caché válida → reconstruir
+
+    return actualizar_cache(url, limpiar)
+
+
+def version_datos(df):
+    """Versión (hash de fuente + código) con la que se construyó el DataFrame."""
+    return df.attrs.get("version", "")
+
+
+def clave_datos(df, columnas=None):
+    """
+    Clave para cachés derivadas del DataFrame (cubos, índices...).
+    Usa la versión del dataset; si no la tiene, un hash de ``columnas``.
+    """
+    version = version_datos(df)
+    if not version:
+        columnas = list(df.columns if columnas is None else columnas)
+        version = str(pd.util.hash_pandas_object(df[columnas], index=False).sum())
+
+    return f"{version}-{len(df)}"
+
+
+# ============================================================
+# 🔄 Función principal de carga
+# ============================================================
+
+def load_data():
+    """
+    Dataset de negocios verdes limpio (caché en disco + memoria): una vista
+    del DataFrame compartido entre sesiones, actualizado en segundo plano
+    cuando cambia la fuente (ver dataset.py).
+    """
+    from dataset import dataset_compartido  # dataset.py depende de este módulo
+
+    return dataset_compartido(DATA_URL, limpiar_datos).vista()
+
+
+# ============================================================
+# 🖥 CLI: precalentar la caché
+# ============================================================
+# Uso:  python data_loader.py            → construye la caché si falta
+#       python data_loader.py --forzar   → vuelve a descargar y reconstruir
+#       python data_loader.py --memoria  → además imprime el ahorro de memoria
+#       python data_loader.py --bloques 100000 → ingesta por bloques (archivos grandes)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalienta la caché Parquet del dataset.")
+    parser.add_argument("--url", default=DATA_URL, help="CSV de origen (URL o ruta local)")
+    parser.add_argument("--forzar", action="store_true", help="Ignora la caché existente")
+    parser.add_argument("--memoria", action="store_true", help="Reporte de memoria por columna")
+    parser.add_argument(
+        "--bloques", type=int, default=FILAS_POR_BLOQUE, metavar="FILAS",
+        help="Lee y limpia el CSV por bloques de FILAS filas",
+    )
+    args = parser.parse_args()
+
+    if args.bloques and not args.memoria:
+        # Solo construir: el dataset completo nunca se carga en memoria
+        archivo, version, _ = construir_cache(args.url, limpiar_datos, args.bloques)
+        filas = pq.ParquetFile(archivo).metadata.num_rows
+        print(f"Caché lista: {filas:,} filas · versión {version}")
+    else:
+        if args.forzar or args.bloques:
+            datos = actualizar_cache(args.url, limpiar_datos, args.bloques)
+        else:
+            datos = cargar_con_cache(args.url, limpiar_datos)
+
+        print(f"Caché lista: {len(datos):,} filas · versión {version_datos(datos)}")
+
+        if args.memoria:
+            print(reporte_memoria(datos).to_string())
@@ -0,0 +1,121 @@
+# ============================================================
+# 📌 data_loader_zni.py — Carga y limpieza del dataset de Zonas No Interconectadas
+# ============================================================
+
+import argparse
+
+import numpy as np
+import pandas as pd
+from canonico import canonizar_serie
+from data_loader import cargar_con_cache, actualizar_cache, version_datos
+from dataset import dataset_compartido
+from esquema import aplicar_esquema
+
+
+# ============================================================
+# 🔽 URL oficial del dataset
+# ============================================================
+
+ZNI_URL = (
+    "https://github.com/juliandariogiraldoocampo/analisis_taltech/raw/refs/heads/main/explorador/"
+    "Estado_de_la_prestaci%C3%B3n_del_servicio_de_energ%C3%ADa_en_Zonas_No_Interconectadas_20251021.csv"
+)
+
+# Columnas de energía: se guardan como enteros (kWh truncados, como en las apps)
+COLUMNAS_ENERGIA = ["ENERGÍA ACTIVA", "ENERGÍA REACTIVA"]
+COLUMNA_POTENCIA = "POTENCIA MÁXIMA"
+
+# Departamentos insulares que las gráficas continentales excluyen
+SAN_ANDRES = [
+    "ARCHIPIELAGO DE SAN ANDRES",
+    "ARCHIPIELAGO DE SAN ANDRES y PROVIDENCIA",
+    "ARCHIPIELAGO DE SAN ANDRES, PROVIDENCIA Y SANTA CATALINA",
+]
+
+# Columnas de texto con pocos valores → category (ver esquema.py)
+ESQUEMA_ZNI = {
+    "DEPARTAMENTO": None,
+    "MUNICIPIO": None,
+}
+
+# Departamento y municipio: sin tildes (se conserva la Ñ) y espacios limpios (ver canonico.py)
+REGLAS_ZNI = {"plegar": True}
+
+
+# ============================================================
+# 🧩 Reglas por valor
+# ============================================================
+
+def _a_numero(serie):
+    """Texto con separador de miles ('1,234.5') → float; ya numérico se deja igual."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+
+    return pd.to_numeric(serie.str.replace(",", "", regex=False), errors="coerce")
+
+
+def _a_entero(valores):
+    """Trunca a entero; con vacíos usa Int64 para no perder filas."""
+    valores = np.trunc(valores)
+    return valores.astype("int64") if valores.notna().all() else valores.astype("Int64")
+
+
+# ============================================================
+# 🧹 Limpieza del dataset
+# ============================================================
+
+def limpiar_zni(df):
+    """Convierte energía y potencia a números y canoniza departamento y municipio."""
+
+    df.columns = df.columns.str.strip()
+
+    for col in COLUMNAS_ENERGIA:
+        if col in df.columns:
+            df[col] = _a_entero(_a_numero(df[col]))
+
+    if COLUMNA_POTENCIA in df.columns:
+        df[COLUMNA_POTENCIA] = _a_numero(df[COLUMNA_POTENCIA])
+
+    for col in ["DEPARTAMENTO", "MUNICIPIO"]:
+        if col in df.columns:
+            df[col] = canonizar_serie(df[col], **REGLAS_ZNI)
+
+    return aplicar_esquema(df, ESQUEMA_ZNI)
+
+
+def continental(df):
+    """Máscara de filas fuera del archipiélago de San Andrés."""
+    return ~df["DEPARTAMENTO"].isin(SAN_ANDRES).to_numpy(dtype=bool)
+
+
+# ============================================================
+# 🔄 Función principal de carga
+# ============================================================
+
+def load_zni(precalentar=()):
+    """
+    Dataset ZNI limpio: vista del DataFrame compartido entre sesiones y
+    actualizado en segundo plano (ver dataset.py). ``precalentar``: agregados
+    a calcular con cada versión nueva antes de ponerla en uso.
+    """
+    return dataset_compartido(ZNI_URL, limpiar_zni, precalentar).vista()
+
+
+# ============================================================
+# 🖥 CLI: precalentar la caché
+# ============================================================
+# Uso:  python data_loader_zni.py            → construye la caché si falta
+#       python data_loader_zni.py --forzar   → vuelve a descargar y reconstruir
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalienta la caché Parquet del dataset ZNI.")
+    parser.add_argument("--url", default=ZNI_URL, help="CSV de origen (URL o ruta local)")
+    parser.add_argument("--forzar", action="store_true", help="Ignora la caché existente")
+    args = parser.parse_args()
+
+    if args.forzar:
+        datos = actualizar_cache(args.url, limpiar_zni)
+    else:
+        datos = cargar_con_cache(args.url, limpiar_zni)
+
+    print(f"Caché lista: {len(datos):,} filas · versión {version_datos(datos)}")
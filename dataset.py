@@ -0,0 +1,175 @@
+# ============================================================
+# 📌 dataset.py — Dataset limpio compartido entre sesiones
+# ============================================================
+# ``st.cache_data`` entrega una copia completa del DataFrame en cada rerun
+# (y las apps que le agregaban columnas modificaban el objeto cacheado).
+# Aquí el DataFrame se carga una sola vez por proceso (``st.cache_resource``)
+# y cada sesión recibe una vista: con copy-on-write de pandas la vista
+# comparte los arreglos del original y solo copia lo que llegue a modificar.
+# Un hilo en segundo plano revisa la fuente cada cierto tiempo y, si cambió,
+# limpia la versión nueva y la pone en uso de una vez (sección 🔁 al final).
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from data_loader import actualizar_cache, cargar_con_cache, firma_fuente, huella_codigo, version_datos
+from filtros import IndiceFiltros
+
+# Las vistas comparten memoria con el original sin riesgo de modificarlo
+pd.set_option("mode.copy_on_write", True)
+
+# Segundos entre revisiones de la fuente (0 = no revisar)
+SEGUNDOS_ACTUALIZACION = int(os.environ.get("DASHBOARD_ACTUALIZAR_SEG", 3600))
+
+_log = logging.getLogger(__name__)
+
+
+class DatasetCompartido:
+    """
+    DataFrame de solo lectura compartido por todas las sesiones. Entrega
+    vistas (``vista``) y columnas derivadas calculadas una sola vez.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._derivadas = {}
+        self._candado = threading.Lock()
+
+    @property
+    def version(self):
+        return version_datos(self._df)
+
+    def __len__(self):
+        return len(self._df)
+
+    def derivada(self, nombre, calcular, df=None):
+        """
+        Columna ``calcular(df)`` (Series alineada con el dataset) calculada
+        la primera vez que se pide y compartida después. ``df`` por defecto
+        es el dataset completo.
+        """
+        with self._candado:
+            if nombre not in self._derivadas:
+                self._derivadas[nombre] = calcular(self._df if df is None else df)
+            return self._derivadas[nombre]
+
+    def vista(self, mascara=None, derivadas=None):
+        """
+        DataFrame para una sesión sin copiar los datos: las columnas base,
+        las ``derivadas`` (``{nombre: calcular}``, en orden; cada una recibe
+        la vista con las anteriores) y solo las filas de ``mascara``.
+        """
+        df = self._df.copy(deep=False)
+
+        for nombre, calcular in (derivadas or {}).items():
+            df[nombre] = self.derivada(nombre, calcular, df)
+        if derivadas and self.version:
+            # Las cachés por versión (cubos, índices) no deben mezclar esquemas
+            df.attrs["version"] = "+".join([self.version, *derivadas])
+
+        return df if mascara is None else IndiceFiltros.aplicar(df, mascara)
+
+
+# ============================================================
+# 🔁 Actualización en segundo plano
+# ============================================================
+
+class FuenteCompartida:
+    """
+    Versión vigente del dataset de ``url`` más el hilo que la actualiza.
+    La versión nueva se descarga, se limpia y se precalienta fuera de las
+    sesiones; ``actual`` solo se reemplaza cuando está completa.
+    """
+
+    def __init__(self, url, limpiar, segundos=SEGUNDOS_ACTUALIZACION):
+        self.url = url
+        self.limpiar = limpiar
+        self.segundos = segundos
+        self.actual = DatasetCompartido(cargar_con_cache(url, limpiar))
+        self._firma = None
+        self._precalentar = {}
+        self._revision = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def precalentar(self, funciones):
+        """
+        Registra funciones ``f(df)`` (cubos, agregados) a calcular antes de
+        cada cambio. Se identifican por nombre: registrarlas en cada rerun
+        no las duplica.
+        """
+        for funcion in funciones:
+            self._precalentar[f"{funcion.__module__}.{funcion.__qualname__}"] = funcion
+
+    def revisar(self):
+        """
+        Revisa la fuente y, si cambió, pone en uso la versión nueva.
+        Devuelve True si hubo cambio de versión.
+        """
+        with self._revision:
+            firma = firma_fuente(self.url, self._firma)
+            if firma is not None and firma == self._firma:
+                return False
+
+            # El hash del contenido decide: misma versión → no se vuelve a leer
+            df = actualizar_cache(self.url, self.limpiar, version_actual=self.actual.version)
+            self._firma = firma
+            if df is None:
+                return False
+
+            nuevo = DatasetCompartido(df)
+            for funcion in list(self._precalentar.values()):
+                funcion(nuevo.vista())
+
+            self.actual = nuevo
+            return True
+
+    def iniciar(self):
+        """Arranca el hilo de revisión (una vez; no hace nada si ``segundos`` es 0)."""
+        if self.segundos > 0 and self._hilo is None:
+            self._hilo = threading.Thread(
+                target=self._ciclo, name=f"actualizar-{Path(self.url).name}", daemon=True
+            )
+            self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo de revisión."""
+        self._detener.set()
+
+    def _ciclo(self):
+        while not self._detener.wait(self.segundos):
+            try:
+                if self.revisar():
+                    _log.info("Dataset %s actualizado a la versión %s", self.url, self.actual.version)
+            except Exception:  # noqa: BLE001
+                # Sin conexión o fuente inválida: se sigue usando la versión vigente
+                _log.warning("No se pudo actualizar %s", self.url, exc_info=True)
+
+
+@st.cache_resource(show_spinner="Cargando datos…")
+def _fuente_en_cache(url, huella, _limpiar):
+    fuente = FuenteCompartida(url, _limpiar)
+    fuente.iniciar()
+    return fuente
+
+
+def fuente_compartida(url, limpiar):
+    """Fuente de ``url`` (una por proceso y por versión del código de ``limpiar``)."""
+    return _fuente_en_cache(url, huella_codigo(limpiar), limpiar)
+
+
+def dataset_compartido(url, limpiar, precalentar=()):
+    """
+    Versión vigente del dataset limpio de ``url`` (caché Parquet en disco),
+    cargado una vez por proceso y actualizado en segundo plano.
+    ``precalentar``: funciones ``f(df)`` que se calculan con cada versión
+    nueva antes de ponerla en uso.
+    """
+    fuente = fuente_compartida(url, limpiar)
+    fuente.precalentar(precalentar)
+    return fuente.actual
@@ -0,0 +1,67 @@
+# ============================================================
+# 📌 esquema.py — Tipos categóricos del dataset limpio
+# ============================================================
+
+import pandas as pd
+
+from config import DEPARTMENT_COORDS, MAPEO_REGION, REGION_COLORS
+
+
+def _sin_repetir(*listas):
+    """Une listas conservando el primer orden de aparición."""
+    return list(dict.fromkeys(valor for lista in listas for valor in lista))
+
+
+# ============================================================
+# 📐 Esquema declarado
+# ============================================================
+# Columna → categorías fijas (None = solo las observadas en los datos).
+# Los valores que no estén en la lista fija se agregan al final como
+# categorías extra, de modo que ningún dato se pierde al convertir.
+
+ESQUEMA = {
+    "REGIÓN": _sin_repetir(REGION_COLORS, MAPEO_REGION.values()),
+    "DEPARTAMENTO": list(DEPARTMENT_COORDS),
+    "MUNICIPIO": None,
+    "AUTORIDAD AMBIENTAL": list(MAPEO_REGION),
+    "CATEGORÍA": None,
+    "SECTOR": None,
+    "SUBSECTOR": None,
+    "BASURA 0": ["Sí", "No"],
+    "PRODUCTO PRINCIPAL": None,
+    "RELACIÓN BASURA CERO": None,
+}
+
+
+def aplicar_esquema(df, esquema=ESQUEMA):
+    """Convierte las columnas del esquema a ``category`` (categorías fijas + observadas)."""
+    for col, fijas in esquema.items():
+        if col not in df.columns:
+            continue
+
+        observadas = df[col].dropna().unique().tolist()
+        extras = sorted(set(observadas).difference(fijas or []), key=str)
+        df[col] = pd.Categorical(df[col], categories=_sin_repetir(fijas or [], extras))
+
+    return df
+
+
+# ============================================================
+# 📊 Reporte de memoria
+# ============================================================
+
+def reporte_memoria(df):
+    """
+    Compara la memoria de cada columna categórica con su equivalente en
+    texto (object). Retorna un DataFrame en KB con el ahorro porcentual.
+    """
+    categoricas = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+
+    antes = df.astype({col: object for col in categoricas}).memory_usage(deep=True, index=False)
+    despues = df.memory_usage(deep=True, index=False)
+
+    reporte = pd.DataFrame({"ANTES (KB)": antes / 1024, "DESPUÉS (KB)": despues / 1024})
+    reporte.loc["TOTAL"] = reporte.sum()
+    reporte["AHORRO %"] = 100 * (1 - reporte["DESPUÉS (KB)"] / reporte["ANTES (KB)"])
+
+    return reporte.round(1)
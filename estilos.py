@@ -0,0 +1,103 @@
+# ============================================================
+# 📌 estilos.py — Hoja de estilos única por app (compuesta una vez)
+# ============================================================
+# Cada app tenía varios bloques <style> (f-strings con imágenes en base64)
+# que se rearmaban en cada rerun. Aquí los archivos de assets/ y las
+# imágenes (como variables CSS con su data URI) se unen y se minifican una
+# sola vez por proceso. Como el mensaje resultante es idéntico en cada
+# rerun, Streamlit lo envía completo solo la primera vez (caché de
+# mensajes del navegador) y después solo su hash.
+
+import re
+from pathlib import Path
+
+import streamlit as st
+
+from recursos import data_uri, firma_imagen
+
+DIR_ESTILOS = Path(__file__).parent / "assets"
+
+_COMENTARIOS = re.compile(r"/\*.*?\*/", re.S)
+_ESPACIOS = re.compile(r"\s+")
+_ALREDEDOR = re.compile(r"\s*([{};,>])\s*")
+_DOS_PUNTOS = re.compile(r":\s+")
+
+
+# ============================================================
+# 🗜 Minificación
+# ============================================================
+
+def minificar_css(css):
+    """Quita comentarios, saltos de línea y espacios sobrantes de un CSS."""
+    css = _COMENTARIOS.sub("", css)
+    css = _ESPACIOS.sub(" ", css)
+    css = _ALREDEDOR.sub(r"\1", css)
+    css = _DOS_PUNTOS.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+# ============================================================
+# 🎨 Composición
+# ============================================================
+
+def _firma_css(ruta):
+    try:
+        return ruta.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def componer_css(archivos, imagenes=()):
+    """
+    CSS de ``archivos`` (nombres dentro de assets/, en orden) precedido por
+    ``:root`` con una variable por imagen: ``imagenes`` son pares
+    ``(variable, ruta)`` y la variable vale ``url("data:...")``.
+    Archivos o imágenes inexistentes se omiten.
+    """
+    variables = []
+    for variable, ruta in imagenes:
+        uri = data_uri(ruta)
+        if uri is not None:
+            variables.append(f'{variable}: url("{uri}");')
+
+    partes = [":root {" + "".join(variables) + "}"] if variables else []
+    for nombre in archivos:
+        ruta = DIR_ESTILOS / nombre
+        if ruta.exists():
+            partes.append(ruta.read_text(encoding="utf-8"))
+
+    return minificar_css("\n".join(partes))
+
+
+@st.cache_resource(show_spinner=False)
+def _hoja_en_cache(archivos, imagenes, firmas):
+    return f"<style>{componer_css(archivos, imagenes)}</style>"
+
+
+def hoja_estilos(*archivos, imagenes=None):
+    """
+    Bloque ``<style>`` de la app, compuesto una vez por proceso. Se vuelve
+    a componer solo si cambia alguno de los archivos o de las imágenes.
+    """
+    imagenes = tuple((imagenes or {}).items())
+    firmas = (
+        tuple(_firma_css(DIR_ESTILOS / nombre) for nombre in archivos),
+        tuple(firma_imagen(ruta) for _, ruta in imagenes),
+    )
+    return _hoja_en_cache(archivos, imagenes, firmas)
+
+
+def aplicar_estilos(*archivos, imagenes=None):
+    """
+    Inserta la hoja de estilos de la app (un solo ``st.markdown``).
+    ``imagenes``: ``{"--variable": "img/archivo.png"}``. Avisa si falta
+    algún archivo de estilos o alguna imagen.
+    """
+    for nombre in archivos:
+        if not (DIR_ESTILOS / nombre).exists():
+            st.warning(f"⚠ No se encontró el archivo assets/{nombre}")
+    for ruta in (imagenes or {}).values():
+        if firma_imagen(ruta) is None:
+            st.warning(f"Imagen no encontrada en {ruta}. Usando placeholder.")
+
+    st.markdown(hoja_estilos(*archivos, imagenes=imagenes), unsafe_allow_html=True)
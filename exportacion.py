@@ -0,0 +1,186 @@
+# ============================================================
+# 📌 exportacion.py — Descargas del dataset (CSV, CSV.gz, Parquet)
+# ============================================================
+
+import gzip
+import hashlib
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import streamlit as st
+
+from clasificador import COLUMNA_BITS
+from data_loader import clave_datos
+
+# Formato → (extensión, tipo MIME)
+FORMATOS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV.gz": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+# Columnas internas que nunca se exportan
+COLUMNAS_INTERNAS = (COLUMNA_BITS,)
+
+
+def columnas_exportables(df):
+    """Columnas visibles para el usuario (sin las columnas internas)."""
+    return [col for col in df.columns if col not in COLUMNAS_INTERNAS]
+
+
+def a_csv(df):
+    """
+    CSV en UTF-8 con el escritor de Arrow (mucho más rápido que ``to_csv``
+    con textos largos). Los textos van entre comillas; los vacíos, sin nada.
+    """
+    salida = pa.BufferOutputStream()
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), salida)
+    return salida.getvalue().to_pybytes()
+
+
+# ============================================================
+# 🧾 CSV con índice de filas
+# ============================================================
+
+class CSVIndexado:
+    """
+    CSV serializado una sola vez junto con la posición en bytes donde
+    empieza cada fila. Una vista filtrada se arma copiando tramos de
+    bytes, sin volver a convertir los valores a texto.
+    """
+
+    def __init__(self, df):
+        contenido = a_csv(df)
+        self.contenido = contenido
+
+        # Un salto de línea termina fila solo si no está dentro de comillas:
+        # la paridad de comillas anteriores lo decide ("" escapado suma 2)
+        datos = np.frombuffer(contenido, dtype=np.uint8)
+        comillas = np.flatnonzero(datos == ord('"'))
+        saltos = np.flatnonzero(datos == ord("\n"))
+        fines = saltos[np.searchsorted(comillas, saltos) % 2 == 0] + 1
+
+        # fines[0] cierra el encabezado; cada fila i ocupa [inicios[i], inicios[i + 1])
+        self.encabezado = fines[0]
+        self.inicios = fines
+
+    def filas(self, posiciones):
+        """CSV (con encabezado) de las filas en ``posiciones`` (ordenadas)."""
+        posiciones = np.asarray(posiciones, dtype=np.intp)
+        vista = memoryview(self.contenido)
+
+        if len(posiciones) == 0:
+            return bytes(vista[:self.encabezado])
+
+        # Filas consecutivas se copian como un solo tramo
+        cortes = np.flatnonzero(np.diff(posiciones) != 1) + 1
+        primeras = posiciones[np.r_[0, cortes]]
+        ultimas = posiciones[np.r_[cortes - 1, len(posiciones) - 1]]
+
+        tramos = [vista[:self.encabezado]]
+        tramos += [
+            vista[self.inicios[a]:self.inicios[b + 1]]
+            for a, b in zip(primeras.tolist(), ultimas.tolist())
+        ]
+        return b"".join(tramos)
+
+
+def comprimir(contenido):
+    """gzip nivel 6: casi el mismo tamaño que el nivel 9, en menos tiempo."""
+    return gzip.compress(contenido, compresslevel=6, mtime=0)
+
+
+def serializar(df, formato):
+    """Bytes de ``df`` en el formato pedido (ver ``FORMATOS``)."""
+    if formato == "Parquet":
+        return df.to_parquet(index=False)
+
+    contenido = a_csv(df)
+    if formato == "CSV.gz":
+        return comprimir(contenido)
+
+    return contenido
+
+
+# ============================================================
+# 💾 Cachés (compartidas: los bytes no se copian en cada rerun)
+# ============================================================
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _csv_en_cache(_df, clave):
+    return CSVIndexado(_df[columnas_exportables(_df)])
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _completo_en_cache(_df, clave, formato):
+    if formato == "CSV":
+        return _csv_en_cache(_df, clave).contenido
+    if formato == "CSV.gz":
+        return comprimir(_csv_en_cache(_df, clave).contenido)
+
+    return serializar(_df[columnas_exportables(_df)], formato)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _filtrado_en_cache(_df, _posiciones, clave, seleccion, formato):
+    csv = _csv_en_cache(_df, clave)
+
+    if formato == "CSV":
+        return csv.filas(_posiciones)
+    if formato == "CSV.gz":
+        return comprimir(csv.filas(_posiciones))
+
+    return serializar(_df[columnas_exportables(_df)].take(_posiciones), formato)
+
+
+def exportar(df, formato, mascara=None):
+    """
+    Bytes del dataset completo (o de las filas con ``mascara`` True), en
+    caché por versión del dataset. La vista filtrada reutiliza el CSV de
+    la base completa en lugar de serializar de nuevo.
+    """
+    clave = clave_datos(df)
+
+    if mascara is None or mascara.all():
+        return _completo_en_cache(df, clave, formato)
+
+    mascara = np.asarray(mascara, dtype=bool)
+    seleccion = hashlib.sha1(np.packbits(mascara).tobytes()).hexdigest()
+    return _filtrado_en_cache(df, np.flatnonzero(mascara), clave, seleccion, formato)
+
+
+# ============================================================
+# 📥 Botones de descarga
+# ============================================================
+
+def botones_descarga(df, nombre, mascara=None, clave="base"):
+    """
+    Selector de formato y botones para la base completa y, si hay filtros
+    activos, para la vista filtrada. Los bytes salen de la caché, así que
+    un rerun sin clic no vuelve a serializar nada.
+    """
+    formato = st.radio(
+        "Formato de descarga",
+        list(FORMATOS),
+        horizontal=True,
+        key=f"formato_descarga_{clave}",
+    )
+    extension, mime = FORMATOS[formato]
+
+    st.download_button(
+        label=f"📥 Descargar Base de Datos en {formato}",
+        data=exportar(df, formato),
+        file_name=f"{nombre}{extension}",
+        mime=mime,
+        key=f"descarga_{clave}",
+    )
+
+    if mascara is not None and not mascara.all():
+        st.download_button(
+            label=f"📥 Descargar vista filtrada ({int(mascara.sum()):,} filas) en {formato}",
+            data=exportar(df, formato, mascara),
+            file_name=f"{nombre}_filtrado{extension}",
+            mime=mime,
+            key=f"descarga_filtrada_{clave}",
+        )
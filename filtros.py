@@ -0,0 +1,109 @@
+# ============================================================
+# 📌 filtros.py — Índice invertido para los filtros multiselect
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import clave_datos
+
+
+# ============================================================
+# 🗂 Índice por columna: valor → posiciones de fila
+# ============================================================
+
+class IndiceFiltros:
+    """
+    Índice invertido de columnas categóricas, construido una sola vez.
+
+    Cada columna se factoriza en códigos y las posiciones de fila se ordenan
+    por código, de modo que las filas de un valor son un tramo contiguo.
+    Una combinación de filtros se resuelve como AND de máscaras booleanas
+    y un único ``take`` final, sin copias intermedias del DataFrame.
+    """
+
+    def __init__(self, df, columnas):
+        self.n_filas = len(df)
+        self._valores = {}
+        self._orden = {}
+        self._limites = {}
+
+        for col in columnas:
+            if col not in df.columns:
+                continue
+
+            serie = df[col]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                # Columnas categóricas: los códigos ya existen
+                codigos, valores = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codigos, valores = pd.factorize(serie)
+
+            # Vacíos (NaN) quedan con código -1 y nunca se seleccionan
+            orden = np.argsort(codigos, kind="stable")
+
+            self._valores[col] = pd.Index(valores)
+            self._orden[col] = orden
+            self._limites[col] = np.searchsorted(
+                codigos[orden], np.arange(len(valores) + 1)
+            )
+
+    def __contains__(self, columna):
+        return columna in self._valores
+
+    def opciones(self, columna):
+        """Valores presentes (ordenados, sin vacíos ni textos en blanco)."""
+        if columna not in self._valores:
+            return []
+
+        presentes = np.diff(self._limites[columna]) > 0
+        return sorted(
+            valor
+            for valor, presente in zip(self._valores[columna], presentes)
+            if presente and str(valor).strip()
+        )
+
+    def posiciones(self, columna, valores):
+        """Posiciones de las filas cuyo valor en ``columna`` está en ``valores``."""
+        codigos = self._valores[columna].get_indexer(list(valores))
+        orden, limites = self._orden[columna], self._limites[columna]
+
+        tramos = [orden[limites[c]:limites[c + 1]] for c in codigos if c >= 0]
+        return np.concatenate(tramos) if tramos else np.array([], dtype=np.intp)
+
+    def mascara(self, filtros):
+        """
+        AND de los filtros ``{columna: valores}``. Cada columna incluida se
+        aplica aunque su lista esté vacía (equivale a ``isin([])``).
+        """
+        mascara = np.ones(self.n_filas, dtype=bool)
+
+        for columna, valores in filtros.items():
+            seleccion = np.zeros(self.n_filas, dtype=bool)
+            seleccion[self.posiciones(columna, valores)] = True
+            mascara &= seleccion
+
+        return mascara
+
+    @staticmethod
+    def aplicar(df, mascara):
+        """Devuelve las filas seleccionadas con un solo ``take`` (o el mismo df si no hay filtro)."""
+        if mascara.all():
+            return df
+
+        return df.take(np.flatnonzero(mascara))
+
+
+@st.cache_resource(show_spinner=False)
+def _indice_en_cache(_df, clave, columnas):
+    return IndiceFiltros(_df, columnas)
+
+
+def indice_filtros(df, columnas):
+    """
+    Índice de filtros compartido entre sesiones, construido una vez por
+    versión del dataset. Es de solo lectura.
+    """
+    columnas = tuple(col for col in columnas if col in df.columns)
+    return _indice_en_cache(df, clave_datos(df, columnas), columnas)
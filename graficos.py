@@ -3,74 +3,336 @@
 # ============================================================
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 
+from agregados import alineadas, totales
+from cache_figuras import mostrar_figura, mostrar_plotly
+
 
 # ============================================================
 # 🌿 Top sectores
 # ============================================================
 
-def grafico_top_sectores(df):
-    """Grafica los 10 sectores con más negocios verdes."""
+def datos_top_sectores(cubo):
+    """Los 10 sectores con más negocios verdes (None si no hay datos)."""
+    if cubo["TOTAL"].sum() == 0 or "SECTOR" not in cubo.columns:
+        return None
 
-    if df.empty or "SECTOR" not in df.columns:
-        st.info("No hay datos válidos para mostrar sectores.")
-        return
+    return totales(cubo, "SECTOR").head(10)
 
-    top = df["SECTOR"].value_counts().head(10)
 
-    fig, ax = plt.subplots(figsize=(6, 4))
+def dibujar_top_sectores(top, tamano=(6, 4)):
+    fig, ax = plt.subplots(figsize=tamano)
     sns.barplot(x=top.values, y=top.index, palette="Greens_r", ax=ax)
 
     ax.set_title("Top 10 Sectores", fontsize=12)
     ax.set_xlabel("Cantidad")
     ax.set_ylabel("Sector")
 
-    st.pyplot(fig)
+    return fig
+
+
+def figura_top_sectores(cubo):
+    """Barras de los 10 sectores con más negocios verdes (None si no hay datos)."""
+    top = datos_top_sectores(cubo)
+    return None if top is None else dibujar_top_sectores(top)
+
+
+def grafico_top_sectores(cubo):
+    """Grafica los 10 sectores con más negocios verdes (imagen en caché por datos)."""
+    top = datos_top_sectores(cubo)
+
+    if top is None:
+        st.info("No hay datos válidos para mostrar sectores.")
+        return
+
+    mostrar_figura("graficos.top_sectores", top, dibujar_top_sectores, (6, 4))
 
 
 # ============================================================
 # 📈 Tendencia anual
 # ============================================================
 
-def grafico_tendencia(df):
-    """Línea de tiempo: negocios registrados por año."""
-    df_y = df.dropna(subset=["AÑO"])
+def datos_tendencia(cubo):
+    """Negocios registrados por año (None si no hay años válidos)."""
+    if "AÑO" not in cubo.columns or cubo["AÑO"].isna().all():
+        return None
 
-    if df_y.empty:
-        st.info("Sin datos de años válidos.")
-        return
+    return cubo.groupby("AÑO")["TOTAL"].sum()
 
-    conteo = df_y.groupby("AÑO").size()
 
-    fig, ax = plt.subplots(figsize=(6, 3))
+def dibujar_tendencia(conteo, tamano=(6, 3)):
+    fig, ax = plt.subplots(figsize=tamano)
     sns.lineplot(x=conteo.index, y=conteo.values, marker="o", ax=ax)
 
     ax.set_title("Tendencia anual", fontsize=12)
     ax.set_xlabel("Año")
     ax.set_ylabel("Cantidad")
 
-    st.pyplot(fig)
+    return fig
+
+
+def figura_tendencia(cubo):
+    """Línea de negocios registrados por año (None si no hay años válidos)."""
+    conteo = datos_tendencia(cubo)
+    return None if conteo is None else dibujar_tendencia(conteo)
+
+
+def grafico_tendencia(cubo):
+    """Línea de tiempo: negocios registrados por año (imagen en caché por datos)."""
+    conteo = datos_tendencia(cubo)
+
+    if conteo is None:
+        st.info("Sin datos de años válidos.")
+        return
+
+    mostrar_figura("graficos.tendencia", conteo, dibujar_tendencia, (6, 3))
 
 
 # ============================================================
-# ♻ Pie chart Basura Cero
+# 🎨 Figuras verdes de las páginas de inicio (app2 / app7)
 # ============================================================
 
-def grafico_relacion_pie(df):
-    """Grafica proporción de iniciativas que tienen relación con Basura Cero."""
+# Tema que las apps fijaban globalmente con sns.set_style / plt.rcParams
+TEMA_VERDE = {"tema": "whitegrid", "rc": {"font.family": "Arial"}}
+
+PALETA_SECTORES = [
+    "#E6FFF7",
+    "#B2F2E8",
+    "#66D1BA",
+    "#1FA88E",
+    "#0B5C4A",
+    "#A8E55A",
+    "#88C999",
+    "#C9B79C",
+    "#7BBF8A",
+    "#9CD25B",
+]
+
+
+def dibujar_sectores_verdes(top_sectores, tamano=(6, 4)):
+    """Barras del top 10 de sectores con etiquetas de conteo."""
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.barplot(
+        x=top_sectores.values,
+        y=top_sectores.index,
+        palette=PALETA_SECTORES[: len(top_sectores)],
+        edgecolor="#0B5C4A",
+        ax=ax,
+    )
 
-    tabla = (
-        df["RELACIÓN BASURA CERO"]
-        .fillna("No aplica")
-        .apply(lambda v: "Alineada" if v.lower() != "no aplica" else "No alineada")
-        .value_counts()
-        .reset_index()
+    for container in ax.containers:
+        ax.bar_label(container, fmt="%d", padding=3, fontsize=9, color="#0B5C4A")
+
+    ax.set_title(
+        "Top 10 Sectores con más Negocios Verdes",
+        fontsize=12,
+        weight="bold",
+        color="#0B5C4A",
+        pad=10,
+    )
+    ax.set_xlabel("Número de Negocios", fontsize=10, color="#0B5C4A")
+    ax.set_ylabel("Sector", fontsize=10, color="#0B5C4A")
+    sns.despine(left=True, bottom=True)
+    fig.tight_layout()
+
+    return fig
+
+
+def dibujar_relacion_categorias(relacion_series, tamano=(7, 4)):
+    """Barras de iniciativas por categoría Basura Cero."""
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.barplot(
+        x=relacion_series.values,
+        y=relacion_series.index,
+        palette="Greens",
+        edgecolor="#0B5C4A",
+        ax=ax,
+    )
+    ax.set_xlabel("Número de iniciativas", fontsize=10, color="#0B5C4A")
+    ax.set_ylabel("Categoría Basura Cero", fontsize=10, color="#0B5C4A")
+    ax.set_title(
+        "Iniciativas clasificadas por su relación con Basura Cero",
+        fontsize=12,
+        weight="bold",
+        color="#0B5C4A",
+    )
+    for container in ax.containers:
+        ax.bar_label(container, fmt="%d", padding=3, fontsize=9, color="#0B5C4A")
+    sns.despine(left=True, bottom=True)
+    fig.tight_layout()
+
+    return fig
+
+
+def tamano_calor_regiones(pivot):
+    """Alto del mapa de calor según el número de regiones."""
+    return (8, max(3, 0.5 * len(pivot.index)))
+
+
+def dibujar_calor_regiones(pivot, tamano):
+    """Mapa de calor región × categoría Basura Cero."""
+    fig, ax = plt.subplots(figsize=tamano)
+    sns.heatmap(
+        pivot,
+        cmap="Greens",
+        annot=True,
+        fmt=".0f",
+        linewidths=0.5,
+        cbar_kws={"label": "Número de iniciativas"},
+        ax=ax,
+    )
+    ax.set_xlabel("Categoría Basura Cero", color="#0B5C4A", fontsize=10)
+    ax.set_ylabel("Región", color="#0B5C4A", fontsize=10)
+    ax.set_title(
+        "Mapa de calor: enfoques Basura Cero por región",
+        color="#0B5C4A",
+        fontsize=12,
+        weight="bold",
+        pad=10,
     )
+    fig.tight_layout()
+
+    return fig
 
+
+# Colores de "alineadas / sin relación" en las figuras Plotly de inicio
+COLORES_ALINEACION = {
+    "Iniciativas alineadas": "#1FA88E",
+    "Sin relación identificada": "#C9B79C",
+}
+
+
+def construir_mapa_alineacion(resumen_departamentos):
+    """Burbujas por departamento: tamaño = total, color = % alineadas (lat/lon ocultas)."""
+    fig = px.scatter_mapbox(
+        resumen_departamentos,
+        lat="lat",
+        lon="lon",
+        size="TOTAL",
+        size_max=45,
+        color="PORCENTAJE",
+        color_continuous_scale="Greens",
+        hover_name="DEPARTAMENTO",
+        hover_data={
+            "TOTAL": True,
+            "ALINEADOS": True,
+            "PORCENTAJE": ":.1f",
+            "lat": False,
+            "lon": False,
+        },
+        zoom=4.2,
+        center={"lat": 4.5, "lon": -74.1},
+        mapbox_style="carto-positron",
+    )
+    fig.update_layout(
+        margin={"l": 0, "r": 0, "t": 0, "b": 0},
+        coloraxis_colorbar={"title": "% alineadas"},
+    )
+
+    return fig
+
+
+def construir_relacion_alineacion(resumen_relacion):
+    """Dona de iniciativas alineadas frente a sin relación."""
+    fig = px.pie(
+        resumen_relacion,
+        names="Relación",
+        values="Total",
+        color="Relación",
+        color_discrete_map=COLORES_ALINEACION,
+        hole=0.35,
+    )
+    fig.update_traces(
+        hovertemplate=(
+            "<b>%{label}</b><br>Participación: %{percent}" "<br>Cantidad: %{value}<extra></extra>"
+        ),
+        textinfo="percent+label",
+        textposition="inside",
+    )
+    fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+
+    return fig
+
+
+def construir_autoridades(top_autoridades):
+    """Barras horizontales de las autoridades con más registros."""
+    fig = px.bar(
+        top_autoridades,
+        x="Total",
+        y="AUTORIDAD AMBIENTAL",
+        orientation="h",
+        color="Total",
+        color_continuous_scale="Greens",
+        text="Total",
+    )
+    fig.update_traces(
+        hovertemplate=(
+            "<b>%{y}</b><br>Total de iniciativas: %{x}<extra></extra>"
+        ),
+        textposition="outside",
+    )
+    fig.update_layout(
+        coloraxis_showscale=False,
+        xaxis_title="Número de iniciativas registradas",
+        yaxis_title="Autoridad ambiental",
+        margin=dict(l=0, r=30, t=30, b=0),
+    )
+
+    return fig
+
+
+def construir_autoridades_apiladas(datos):
+    """
+    Barras apiladas alineadas / sin relación por autoridad. ``datos`` es
+    ``(distribucion_autoridad, orden_autoridades)``.
+    """
+    distribucion_autoridad, orden_autoridades = datos
+    fig = px.bar(
+        distribucion_autoridad,
+        x="Total",
+        y="AUTORIDAD_NORMALIZADA",
+        color="ESTADO_ALINEACIÓN",
+        orientation="h",
+        category_orders={"AUTORIDAD_NORMALIZADA": list(orden_autoridades)},
+        color_discrete_map=COLORES_ALINEACION,
+        custom_data=["Porcentaje"],
+    )
+    fig.update_traces(
+        hovertemplate=(
+            "<b>%{y}</b><br>%{color}<br>Total: %{x}<br>Participación: %{customdata[0]:.1f}%<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        barmode="stack",
+        xaxis_title="Número de iniciativas",
+        yaxis_title="Autoridad ambiental",
+        legend_title="Estado de la relación",
+        margin=dict(l=0, r=30, t=30, b=0),
+    )
+
+    return fig
+
+
+# ============================================================
+# ♻ Pie chart Basura Cero
+# ============================================================
+
+def datos_relacion_pie(cubo):
+    """Iniciativas con y sin relación Basura Cero (tabla de dos filas)."""
+    return (
+        cubo.groupby(np.where(alineadas(cubo), "Alineada", "No alineada"))["TOTAL"]
+        .sum()
+        .rename_axis("index")
+        .reset_index(name="RELACIÓN BASURA CERO")
+    )
+
+
+def construir_relacion_pie(tabla):
     fig = px.pie(
         tabla,
         names="index",
@@ -80,20 +342,29 @@ def grafico_relacion_pie(df):
         hole=0.3,
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+def figura_relacion_pie(cubo):
+    """Pie de iniciativas con y sin relación Basura Cero."""
+    return construir_relacion_pie(datos_relacion_pie(cubo))
+
+
+def grafico_relacion_pie(cubo):
+    """Grafica proporción de iniciativas que tienen relación con Basura Cero."""
+    mostrar_plotly(
+        "graficos.relacion_pie",
+        datos_relacion_pie(cubo),
+        construir_relacion_pie,
+        use_container_width=True,
+    )
 
 
 # ============================================================
 # 🗺️ Mapa interactivo por departamento
 # ============================================================
 
-def grafico_mapa(df):
-    """Mapa basado en coordenadas de porcentaje Basura Cero por departamento."""
-
-    if "COORDS" not in df.columns:
-        st.warning("No se encontraron coordenadas para el mapa.")
-        return
-
+def construir_mapa(df):
     fig = px.scatter_mapbox(
         df,
         lat="lat",
@@ -104,6 +375,30 @@ def grafico_mapa(df):
         mapbox_style="carto-positron",
         zoom=4.2,
         hover_name="DEPARTAMENTO",
+        hover_data={"lat": False, "lon": False},
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+
+def figura_mapa(df):
+    """
+    Burbujas por departamento coloreadas por porcentaje Basura Cero.
+    Usa las columnas numéricas ``lat``/``lon`` (ver ``utils.agregar_coordenadas``);
+    None si no hay coordenadas.
+    """
+
+    if not {"lat", "lon"}.issubset(df.columns) or df.empty:
+        return None
+
+    return construir_mapa(df)
+
+
+def grafico_mapa(df):
+    """Mapa basado en coordenadas de porcentaje Basura Cero por departamento."""
+    if not {"lat", "lon"}.issubset(df.columns) or df.empty:
+        st.warning("No se encontraron coordenadas para el mapa.")
+        return
+
+    columnas = ["DEPARTAMENTO", "lat", "lon", "TOTAL", "PORCENTAJE"]
+    mostrar_plotly("graficos.mapa", df[columnas], construir_mapa, use_container_width=True)
@@ -0,0 +1,78 @@
+# ============================================================
+# 📌 kpi_zni.py — Indicadores anuales del dataset ZNI (ventanas de años)
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import clave_datos
+from data_loader_zni import continental
+
+COLUMNA_ANIO = "AÑO SERVICIO"
+
+# Medida → agregación anual
+MEDIDAS = {
+    "ENERGÍA ACTIVA": "sum",
+    "ENERGÍA REACTIVA": "sum",
+    "POTENCIA MÁXIMA": "max",
+}
+
+
+# ============================================================
+# 📅 Totales por año (un solo groupby)
+# ============================================================
+
+def totales_por_anio(df, medidas=MEDIDAS, solo_continental=True):
+    """
+    Una fila por año con todas las medidas. Los años sin registros dentro
+    del rango quedan en NaN para que los deltas no salten años.
+    """
+    medidas = {col: func for col, func in medidas.items() if col in df.columns}
+    base = df[continental(df)] if solo_continental else df
+
+    tabla = base.groupby(COLUMNA_ANIO).agg(medidas).sort_index()
+    if tabla.empty:
+        return tabla
+
+    anios = np.arange(tabla.index.min(), tabla.index.max() + 1)
+    return tabla.reindex(pd.Index(anios, name=COLUMNA_ANIO))
+
+
+@st.cache_data(show_spinner=False)
+def _totales_en_cache(_df, clave):
+    return totales_por_anio(_df)
+
+
+def kpis_anuales(df):
+    """Totales anuales (ver ``MEDIDAS``) calculados una vez por versión del dataset."""
+    return _totales_en_cache(df, clave_datos(df))
+
+
+# ============================================================
+# 🔎 Ventanas de años
+# ============================================================
+
+def indicadores(tabla, medida="ENERGÍA ACTIVA", anios=4, hasta=None):
+    """
+    Últimos ``anios`` años (hasta ``hasta`` o el más reciente) de ``medida``
+    con su variación porcentual frente al año anterior.
+
+    Retorna un DataFrame con columnas AÑO, VALOR y DELTA % (NaN sin año previo).
+    """
+    serie = tabla[medida]
+    if hasta is not None:
+        serie = serie.loc[:hasta]
+
+    delta = serie.pct_change(fill_method=None) * 100
+
+    return pd.DataFrame({
+        "AÑO": serie.index,
+        "VALOR": serie.to_numpy(),
+        "DELTA %": delta.to_numpy(),
+    }).tail(anios).reset_index(drop=True)
+
+
+def formato_delta(delta):
+    """Texto para ``st.metric`` ('12.34%'); None si no hay año anterior."""
+    return None if pd.isna(delta) else f"{round(delta, 2)}%"
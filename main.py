@@ -5,6 +5,7 @@
 import streamlit as st
 from config import *                   # Diccionarios globales
 from data_loader import load_data      # Carga y limpieza de datos
+from estilos import aplicar_estilos    # Hoja de estilos compuesta una vez
 from sections.home import render_home  # Sección Inicio
 from sections.faq import render_faq    # Sección Preguntas
 from sections.mapa import render_mapa  # Sección Mapa del sitio
@@ -23,14 +24,8 @@ st.set_page_config(
 # 🎨 Cargar CSS externo (estilos de la aplicación)
 # ============================================================
 
-def load_css():
-    try:
-        with open("assets/styles.css") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        st.warning("⚠ No se encontró el archivo assets/styles.css")
-
-load_css()
+# Compuesto y minificado una vez por proceso (ver estilos.py)
+aplicar_estilos("styles.css")
 
 # ============================================================
 # 📥 Cargar datos (con caché)
@@ -0,0 +1,101 @@
+# ============================================================
+# 📌 recursos.py — Imágenes livianas para banners y st.image
+# ============================================================
+# Las imágenes de img/ pesan entre 0.6 y 3.3 MB (PNG sin comprimir y un
+# JPG de 8000 px). Aquí se redimensionan al ancho que realmente se muestra
+# y se recodifican (WebP) una sola vez: el archivo resultante queda en la
+# carpeta de caché y su data URI se guarda en memoria por proceso.
+
+import base64
+import os
+from pathlib import Path
+
+import streamlit as st
+from PIL import Image
+
+from data_loader import CACHE_DIR
+
+# Variantes generadas (se regeneran solas si cambia la imagen original)
+DIR_RECURSOS = CACHE_DIR / "recursos"
+
+# Anchos en píxeles: banners a todo lo ancho y fotos dentro de una columna
+ANCHO_BANNER = 1280
+ANCHO_COLUMNA = 960
+
+FORMATO = "webp"
+CALIDAD = 80
+
+_TIPOS_MIME = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+
+# ============================================================
+# 🖼 Variantes en disco
+# ============================================================
+
+def firma_imagen(ruta):
+    """(tamaño, fecha de modificación) de la imagen original; None si no existe."""
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return estado.st_size, estado.st_mtime_ns
+
+
+def variante_imagen(ruta, ancho, formato=FORMATO, calidad=CALIDAD):
+    """
+    Ruta de la copia de ``ruta`` reducida a ``ancho`` píxeles (nunca se
+    amplía) y guardada en ``formato``. Se genera la primera vez; None si
+    la imagen original no existe.
+    """
+    firma = firma_imagen(ruta)
+    if firma is None:
+        return None
+
+    origen = Path(ruta)
+    destino = DIR_RECURSOS / f"{origen.stem}-{ancho}-{firma[0]:x}{firma[1]:x}.{formato}"
+    if destino.exists():
+        return destino
+
+    with Image.open(origen) as imagen:
+        imagen = imagen.convert("RGBA" if "A" in imagen.getbands() else "RGB")
+        if imagen.width > ancho:
+            alto = round(imagen.height * ancho / imagen.width)
+            imagen = imagen.resize((ancho, alto), Image.LANCZOS)
+
+        DIR_RECURSOS.mkdir(parents=True, exist_ok=True)
+        temporal = destino.with_name(destino.name + f".{os.getpid()}.tmp")
+        imagen.save(temporal, format=formato, quality=calidad, optimize=True)
+        os.replace(temporal, destino)
+
+    return destino
+
+
+# ============================================================
+# 🔗 Data URI y rutas para la interfaz
+# ============================================================
+
+@st.cache_resource(show_spinner=False)
+def _uri_en_cache(ruta, ancho, formato, calidad, firma):
+    variante = variante_imagen(ruta, ancho, formato, calidad)
+    contenido = base64.b64encode(variante.read_bytes()).decode()
+    return f"data:{_TIPOS_MIME[formato]};base64,{contenido}"
+
+
+def data_uri(ruta, ancho=ANCHO_BANNER, formato=FORMATO, calidad=CALIDAD):
+    """
+    ``data:`` URI de la variante liviana de ``ruta`` para usar en CSS
+    (``url(...)``). Se codifica una vez por proceso; None si no existe.
+    """
+    firma = firma_imagen(ruta)
+    if firma is None:
+        return None
+    return _uri_en_cache(str(ruta), ancho, formato, calidad, firma)
+
+
+def imagen_liviana(ruta, ancho=ANCHO_COLUMNA, formato=FORMATO, calidad=CALIDAD):
+    """
+    Ruta para ``st.image``: la variante liviana de ``ruta``. Si la imagen
+    no existe se devuelve la ruta original (``st.image`` informa el error).
+    """
+    variante = variante_imagen(ruta, ancho, formato, calidad)
+    return str(variante) if variante is not None else str(ruta)
@@ -1,8 +1,11 @@
 # ============================================================
 # 📌 home.py — Página principal
 # ============================================================
+# Cada gráfico es un st.fragment que obtiene su propio agregado (en caché
+# por versión del dataset): se puede re-ejecutar sin repetir la página.
 
 import streamlit as st
+from agregados import cubo_agregado
 from graficos import (
     grafico_top_sectores,
     grafico_tendencia,
@@ -10,6 +13,24 @@ from graficos import (
 )
 
 
+@st.fragment
+def seccion_sectores(df):
+    st.subheader("📊 Sectores principales")
+    grafico_top_sectores(cubo_agregado(df))
+
+
+@st.fragment
+def seccion_tendencia(df):
+    st.subheader("📈 Tendencia anual")
+    grafico_tendencia(cubo_agregado(df))
+
+
+@st.fragment
+def seccion_basura_cero(df):
+    st.subheader("♻ Iniciativas relacionadas con Basura Cero")
+    grafico_relacion_pie(cubo_agregado(df))
+
+
 def render_home(df):
 
     st.title("🌿 Dashboard de Negocios Verdes")
@@ -18,13 +39,10 @@ def render_home(df):
     st.write(f"Total registros: **{len(df):,}**")
 
     st.markdown("---")
-    st.subheader("📊 Sectores principales")
-    grafico_top_sectores(df)
+    seccion_sectores(df)
 
     st.markdown("---")
-    st.subheader("📈 Tendencia anual")
-    grafico_tendencia(df)
+    seccion_tendencia(df)
 
     st.markdown("---")
-    st.subheader("♻ Iniciativas relacionadas con Basura Cero")
-    grafico_relacion_pie(df)
+    seccion_basura_cero(df)
@@ -2,8 +2,12 @@
 # 📌 utils.py — Funciones auxiliares del proyecto Basura Cero
 # ============================================================
 
+import functools
+
+import numpy as np
 import pandas as pd
 import re
+from canonico import REGLAS_DEPARTAMENTO, canonizar
 from config import (
     DEPARTMENT_CANONICAL,
     DEPARTMENT_COORDS,
@@ -39,21 +43,28 @@ def normalizar_region(region: str):
 # ============================================================
 
 def normalizar_departamento(valor):
-    """Normaliza el nombre de un departamento y devuelve su forma canónica."""
-    if pd.isna(valor):
-        return pd.NA
+    """Normaliza el nombre de un departamento y devuelve su forma canónica (ver canonico.py)."""
+    return canonizar(valor, **REGLAS_DEPARTAMENTO)
+
+# ============================================================
+# 🏛 Normalización de autoridad ambiental, producto y año
+# ============================================================
+
+def normalizar_autoridad(valor):
+    """Autoridad ambiental en mayúsculas; vacío → 'NO REGISTRA'."""
+    texto = str(valor).strip().upper()
+    return texto if texto != "" else "NO REGISTRA"
+
 
-    texto = (
-        str(valor)
-        .strip()
-        .upper()
-        .replace(".", " ")
-        .replace(",", " ")
-    )
+def normalizar_producto(valor):
+    """Producto principal en mayúsculas, sin puntos y con 'MIEL' unificado."""
+    texto = str(valor).upper().replace(".", "")
+    return "MIEL DE ABEJAS" if texto == "MIEL" else texto
 
-    texto = re.sub(r"\s+", " ", texto)  # Normaliza espacios
 
-    return DEPARTMENT_CANONICAL.get(texto, texto)
+def limpiar_anio(valor):
+    """Convierte el año a número quitando separadores de miles (inválido → NaN)."""
+    return pd.to_numeric(str(valor).replace(",", ""), errors="coerce")
 
 # ============================================================
 # 📍 Obtener coordenadas de un departamento
@@ -71,6 +82,36 @@ def coordenadas_departamento(nombre):
 
     return DEPARTMENT_COORDS.get(clave)
 
+
+@functools.lru_cache(maxsize=None)
+def tabla_coordenadas():
+    """
+    Latitud y longitud (float64) indexadas por nombre de departamento: cada
+    nombre canónico de ``DEPARTMENT_COORDS`` y sus variantes de
+    ``DEPARTMENT_CANONICAL``. Se construye una sola vez (no modificar).
+    """
+    coords = pd.DataFrame.from_dict(DEPARTMENT_COORDS, orient="index")[["lat", "lon"]]
+    coords = coords.astype("float64")
+
+    alias = {nombre: nombre for nombre in DEPARTMENT_COORDS}
+    alias.update({
+        variante: canonico
+        for variante, canonico in DEPARTMENT_CANONICAL.items()
+        if canonico in DEPARTMENT_COORDS
+    })
+
+    tabla = coords.loc[list(alias.values())]
+    tabla.index = pd.Index(list(alias), name="DEPARTAMENTO")
+    return tabla
+
+
+def agregar_coordenadas(df, columna="DEPARTAMENTO"):
+    """
+    ``df`` con columnas ``lat`` y ``lon`` unidas por nombre de departamento;
+    las filas sin coordenadas se descartan.
+    """
+    return df.join(tabla_coordenadas(), on=columna, how="inner")
+
 # ============================================================
 # ✂ Limpiar numeración
 # ============================================================
@@ -100,6 +141,7 @@ def tipo_relacion_basura_cero(fila):
 
     return ", ".join(tipos) if tipos else "No aplica"
 
+
 # ============================================================
 # ✔ Validar si un registro tiene relación con Basura Cero
 # ============================================================
@@ -113,6 +155,24 @@ def tiene_relacion_basura_cero(valor):
 
     return valor not in ["", "no aplica", "no disponible"]
 
+# ============================================================
+# ⚡ Aplicar una función una sola vez por valor distinto
+# ============================================================
+
+def mapear_valores_unicos(serie, funcion):
+    """
+    Equivalente a ``serie.apply(funcion)`` pero evaluando la función solo
+    sobre los valores distintos; el resultado se proyecta con los códigos
+    de ``pd.factorize``. Los faltantes usan la última posición de la tabla.
+    """
+    codigos, unicos = pd.factorize(serie)
+
+    tabla = np.empty(len(unicos) + 1, dtype=object)
+    tabla[:-1] = [funcion(valor) for valor in unicos]
+    tabla[-1] = funcion(np.nan)
+
+    return pd.Series(tabla[codigos], index=serie.index, name=serie.name).infer_objects()
+
 # ============================================================
 # 🎯 Utilidades varias
 # ============================================================